@@ -1,20 +1,249 @@
 # gui_main.py
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from threading import Thread
+from threading import Thread, Event, Lock
+import itertools
+import queue
+import csv
 import os
 import re
+from importlib.util import find_spec
 
 # Match main.py import style
-from packages.pdf_to_text import PDFExtractor
-from packages.nltk_stance import StanceDetector
 from packages import ThesisExtractor
 
-# Optional: Gemini validator import (safe if package missing)
-try:
-    from packages.gemini_validator import validate_file as gemini_validate_file
-except Exception:
-    gemini_validate_file = None
+# PyMuPDF, NLTK and the Gemini stack (pandas, tenacity, google-generativeai) take seconds
+# to import, so they are only imported on first use, from a worker thread.
+def _pdf_extractor():
+    from packages.pdf_to_text import PDFExtractor
+    return PDFExtractor
+
+def _stance_detector():
+    from packages.nltk_stance import StanceDetector
+    return StanceDetector
+
+def _analysis_cache():
+    from packages.nltk_stance import AnalysisCache
+    return AnalysisCache()
+
+def _detection_client(address):
+    from packages.detection_service import DetectionClient
+    return DetectionClient(address)
+
+def _nltk_warm_up(progress=None):
+    from packages.nltk_stance import warm_up
+    warm_up(progress)
+
+def _concordance_index(path):
+    from packages.concordance import ConcordanceIndex
+    return ConcordanceIndex(path)
+
+def _gemini_validate_file():
+    # Optional: Gemini validator import (safe if package missing)
+    try:
+        from packages.gemini_validator import validate_file
+    except Exception:
+        return None
+    return validate_file
+
+def _gemini_available():
+    try:
+        return all(find_spec(m) is not None for m in ("pandas", "tenacity", "google.generativeai"))
+    except (ImportError, ValueError):
+        return False
+
+class JobCancelled(Exception):
+    """Raised inside a job's worker when the user cancelled it."""
+
+
+class Job:
+    """
+    One unit of background work. The worker function receives the Job and should call
+    job.report(done, total, message) as it goes; report() raises JobCancelled once the
+    job was cancelled, which is how cancellation reaches library code that only knows
+    about a progress callback.
+    """
+
+    def __init__(self, job_id, name, fn, on_done=None, on_error=None):
+        self.id = job_id
+        self.name = name
+        self.fn = fn
+        self.on_done = on_done
+        self.on_error = on_error
+        self.status = "queued"
+        self.done = 0
+        self.total = 0
+        self.message = ""
+        self._cancel = Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def report(self, done, total=None, message=None):
+        self.check()
+        self.done = done
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message
+
+    @property
+    def fraction(self):
+        return min(1.0, self.done / self.total) if self.total else 0.0
+
+
+class JobManager:
+    """
+    FIFO job queue served by a small pool of daemon worker threads. Workers never touch
+    Tk; finished jobs are handed back through an event queue that the GUI drains with
+    poll() from an after() loop, so on_done/on_error always run on the Tk main thread.
+    """
+
+    def __init__(self, workers=2):
+        self.jobs = []
+        self._ids = itertools.count(1)
+        self._lock = Lock()
+        self._pending = queue.Queue()
+        self._finished = queue.Queue()
+        for _ in range(workers):
+            Thread(target=self._work, daemon=True).start()
+
+    def submit(self, name, fn, on_done=None, on_error=None):
+        job = Job(next(self._ids), name, fn, on_done, on_error)
+        with self._lock:
+            self.jobs.append(job)
+        self._pending.put(job)
+        return job
+
+    def active(self):
+        with self._lock:
+            return [j for j in self.jobs if j.status in {"queued", "running"}]
+
+    def cancel_all(self):
+        for job in self.active():
+            job.cancel()
+
+    def _work(self):
+        while True:
+            job = self._pending.get()
+            if job.cancelled:
+                job.status = "cancelled"
+                self._finished.put((job, None, None))
+                continue
+            job.status = "running"
+            try:
+                result = job.fn(job)
+            except JobCancelled:
+                job.status = "cancelled"
+                self._finished.put((job, None, None))
+            except Exception as e:
+                job.status = "failed"
+                job.message = str(e)
+                self._finished.put((job, None, e))
+            else:
+                job.status = "done"
+                job.done = job.total or job.done
+                self._finished.put((job, result, None))
+
+    def poll(self):
+        """Drain finished jobs and run their callbacks; call from the Tk thread only."""
+        while True:
+            try:
+                job, result, error = self._finished.get_nowait()
+            except queue.Empty:
+                return
+            if error is not None and job.on_error:
+                job.on_error(error)
+            elif job.status == "done" and job.on_done:
+                job.on_done(result)
+
+
+RESULT_COLUMNS = ("sentence", "stance_type", "cue", "start", "end", "section", "page")
+
+
+def _sort_key(value):
+    # Numbers before text before blanks, so mixed CSV columns never compare int to str
+    if value is None or value == "":
+        return (2, "")
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, str(value).lower())
+
+
+class ResultsModel:
+    """
+    Flat marker rows (one tuple per marker, RESULT_COLUMNS order) plus a filtered and
+    sorted view kept as a list of row indices. The table only ever renders one page of
+    that view, so filtering/sorting 100k markers never creates 100k Tk items.
+    """
+
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.view = list(range(len(self.rows)))
+
+    @classmethod
+    def from_markers(cls, results):
+        if hasattr(results, "rows"):
+            # DetectionResults already yields flat marker tuples in RESULT_COLUMNS order
+            return cls(list(results.rows()))
+        rows = []
+        for item in results or []:
+            sent, section, page = item.get("sentence", ""), item.get("section"), item.get("page")
+            for m in item.get("markers", []):
+                rows.append((sent, m["stance_type"], m["cue"], m["start"], m["end"], section, page))
+        return cls(rows)
+
+    @classmethod
+    def from_csv(cls, path):
+        rows = []
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            for rec in reader:
+                row = [rec.get(c, "") for c in RESULT_COLUMNS]
+                for i in (3, 4, 6):
+                    if row[i] and row[i].lstrip("-").isdigit():
+                        row[i] = int(row[i])
+                rows.append(tuple(row))
+        return cls(rows)
+
+    def distinct(self, column):
+        col = RESULT_COLUMNS.index(column)
+        return sorted({r[col] for r in self.rows if r[col] not in (None, "")}, key=_sort_key)
+
+    def select(self, stance_type="", cue="", section="", sort_column=None, descending=False):
+        """Row indices matching the filters, sorted; reads self.rows only, so it is safe off the Tk thread."""
+        st, sec = RESULT_COLUMNS.index("stance_type"), RESULT_COLUMNS.index("section")
+        cue_col, cue = RESULT_COLUMNS.index("cue"), cue.strip().lower()
+        rows = self.rows
+        view = range(len(rows))
+        if stance_type:
+            view = [i for i in view if rows[i][st] == stance_type]
+        if cue:
+            view = [i for i in view if cue in str(rows[i][cue_col]).lower()]
+        if section:
+            view = [i for i in view if str(rows[i][sec] or "") == section]
+        view = list(view)
+        if sort_column:
+            col = RESULT_COLUMNS.index(sort_column)
+            view.sort(key=lambda i: _sort_key(rows[i][col]), reverse=descending)
+        return view
+
+    def apply(self, *args, **kwargs):
+        self.view = self.select(*args, **kwargs)
+        return len(self.view)
+
+    def page(self, number, size):
+        start = number * size
+        return [self.rows[i] for i in self.view[start:start + size]]
+
 
 class StanceGUI(ttk.Frame):
     def __init__(self, master):
@@ -36,12 +265,16 @@ class StanceGUI(ttk.Frame):
         self.section_file_var = tk.StringVar()   # directly chosen section file (optional)
         self.input_path_var = tk.StringVar(value=os.path.join("extracted_txt", "thesis_access1.txt"))
         self.output_path_var = tk.StringVar(value=os.path.join("output", "General_Conclusion_stance.csv"))
-        self.preview_count_var = tk.IntVar(value=5)
+        self.preview_count_var = tk.IntVar(value=200)
+        # Optional warm detection service (python -m packages.detection_service.cli serve)
+        self.service_var = tk.StringVar(value=os.environ.get("STANCE_SERVICE", ""))
+        self.strip_boilerplate_var = tk.BooleanVar(value=False)
 
         # NEW: AI validation controls
         self.use_ai_validate_var = tk.BooleanVar(value=False)
         self.gemini_model_var = tk.StringVar(value="gemini-1.5-pro")
         self.gemini_api_key_var = tk.StringVar(value=os.environ.get("GEMINI_API_KEY", ""))
+        self.tiered_validate_var = tk.BooleanVar(value=False)
 
         # =========== PDF Extraction ===========
         pdf_frame = ttk.LabelFrame(self, text="PDF Extraction")
@@ -105,14 +338,21 @@ class StanceGUI(ttk.Frame):
         self.output_entry = ttk.Entry(io_frame, textvariable=self.output_path_var)
         self.output_browse = ttk.Button(io_frame, text="Save As", command=self.browse_output)
 
-        self.preview_label = ttk.Label(io_frame, text="Preview detections:")
+        self.preview_label = ttk.Label(io_frame, text="Result rows per page:")
         self.preview_spin = ttk.Spinbox(io_frame, from_=1, to=2000, textvariable=self.preview_count_var, width=8)
 
+        self.service_lbl = ttk.Label(io_frame, text="Detection service (host:port, unix:/path; blank = in-process):")
+        self.service_entry = ttk.Entry(io_frame, textvariable=self.service_var, width=36)
+        self.strip_chk = ttk.Checkbutton(io_frame, text="Strip running headers, footers and page numbers",
+                                         variable=self.strip_boilerplate_var)
+
         # AI validation controls
         self.use_ai_chk = ttk.Checkbutton(io_frame, text="Validate with AI (Gemini)", variable=self.use_ai_validate_var)
         self.model_lbl = ttk.Label(io_frame, text="Gemini model:")
         self.model_box = ttk.Combobox(io_frame, textvariable=self.gemini_model_var, width=24,
                                       values=["gemini-1.5-pro","gemini-1.5-flash","gemini-1.5-flash-8b"])
+        self.tiered_chk = ttk.Checkbutton(io_frame, text="Tiered: fast model first, escalate hard rows to selected model",
+                                          variable=self.tiered_validate_var)
         self.api_lbl = ttk.Label(io_frame, text="API key:")
         self.api_entry = ttk.Entry(io_frame, textvariable=self.gemini_api_key_var, width=36, show="*")
 
@@ -130,21 +370,127 @@ class StanceGUI(ttk.Frame):
         self.use_ai_chk.grid(row=5, column=0, sticky="w", pady=(12,2))
         self.model_lbl.grid(row=6, column=0, sticky="w")
         self.model_box.grid(row=6, column=1, sticky="w")
-        self.api_lbl.grid(row=7, column=0, sticky="w")
-        self.api_entry.grid(row=7, column=1, sticky="ew")
+        self.tiered_chk.grid(row=7, column=0, columnspan=2, sticky="w")
+        self.api_lbl.grid(row=8, column=0, sticky="w")
+        self.api_entry.grid(row=8, column=1, sticky="ew")
+        self.service_lbl.grid(row=9, column=0, columnspan=2, sticky="w", pady=(8,2))
+        self.service_entry.grid(row=10, column=0, columnspan=2, sticky="ew", padx=(0,6))
+        self.strip_chk.grid(row=11, column=0, columnspan=2, sticky="w", pady=(8,0))
         io_frame.columnconfigure(0, weight=1)
 
         # =========== Actions and Status ===========
         self.run_button = ttk.Button(self, text="Run Stance Detection", command=self.run_detection)
         self.preview_button = ttk.Button(self, text="Preview", command=self.preview_detections)
-        self.progress = ttk.Progressbar(self, mode="indeterminate")
+        self.progress = ttk.Progressbar(self, mode="determinate", maximum=100)
         self.status_var = tk.StringVar(value="Ready")
         self.status_label = ttk.Label(self, textvariable=self.status_var)
-
-        # =========== Output ===========
-        self.output_text = tk.Text(self, height=14, wrap="word", state="disabled")
-        self.output_scroll = ttk.Scrollbar(self, orient="vertical", command=self.output_text.yview)
+        self.nlp_status_var = tk.StringVar(value="NLP models: loading...")
+        self.nlp_status_label = ttk.Label(self, textvariable=self.nlp_status_var)
+
+        # =========== Background Jobs ===========
+        jobs_frame = ttk.LabelFrame(self, text="Jobs")
+        self.jobs_tree = ttk.Treeview(jobs_frame, columns=("job", "status", "progress"), show="headings", height=3)
+        for col, width in (("job", 320), ("status", 90), ("progress", 260)):
+            self.jobs_tree.heading(col, text=col.capitalize())
+            self.jobs_tree.column(col, width=width, stretch=(col != "status"))
+        self.cancel_job_btn = ttk.Button(jobs_frame, text="Cancel Selected", command=self.cancel_selected_job)
+        self.cancel_all_btn = ttk.Button(jobs_frame, text="Cancel All", command=self.cancel_all_jobs)
+        self.jobs_tree.grid(row=0, column=0, rowspan=2, sticky="nsew", padx=(0,6), pady=4)
+        self.cancel_job_btn.grid(row=0, column=1, sticky="new", pady=(4,2))
+        self.cancel_all_btn.grid(row=1, column=1, sticky="new")
+        jobs_frame.columnconfigure(0, weight=1)
+
+        # =========== Output (log + results table) ===========
+        self.output_tabs = ttk.Notebook(self)
+        log_frame = ttk.Frame(self.output_tabs)
+        self.output_text = tk.Text(log_frame, height=14, wrap="word", state="disabled")
+        self.output_scroll = ttk.Scrollbar(log_frame, orient="vertical", command=self.output_text.yview)
         self.output_text.configure(yscrollcommand=self.output_scroll.set)
+        self.output_text.grid(row=0, column=0, sticky="nsew")
+        self.output_scroll.grid(row=0, column=1, sticky="ns")
+        log_frame.columnconfigure(0, weight=1)
+        log_frame.rowconfigure(0, weight=1)
+
+        results_frame = ttk.Frame(self.output_tabs)
+        self.results_model = ResultsModel()
+        self.results_page = 0
+        self.results_sort = (None, False)
+        self._filter_after = self._filter_job = None
+        self.filter_type_var = tk.StringVar()
+        self.filter_cue_var = tk.StringVar()
+        self.filter_section_var = tk.StringVar()
+        self.results_info_var = tk.StringVar(value="No results loaded.")
+        filter_bar = ttk.Frame(results_frame)
+        ttk.Label(filter_bar, text="Type:").pack(side="left")
+        self.filter_type_box = ttk.Combobox(filter_bar, textvariable=self.filter_type_var, width=14, state="readonly")
+        self.filter_type_box.pack(side="left", padx=(2,8))
+        ttk.Label(filter_bar, text="Cue:").pack(side="left")
+        self.filter_cue_entry = ttk.Entry(filter_bar, textvariable=self.filter_cue_var, width=14)
+        self.filter_cue_entry.pack(side="left", padx=(2,8))
+        ttk.Label(filter_bar, text="Section:").pack(side="left")
+        self.filter_section_box = ttk.Combobox(filter_bar, textvariable=self.filter_section_var, width=22, state="readonly")
+        self.filter_section_box.pack(side="left", padx=(2,8))
+        ttk.Button(filter_bar, text="Apply", command=self.apply_results_filter).pack(side="left")
+        ttk.Button(filter_bar, text="Open CSV", command=self.open_results_csv).pack(side="left", padx=(8,0))
+        ttk.Button(filter_bar, text="Next ▶", command=lambda: self.goto_results_page(self.results_page + 1)).pack(side="right")
+        ttk.Button(filter_bar, text="◀ Prev", command=lambda: self.goto_results_page(self.results_page - 1)).pack(side="right")
+        ttk.Label(filter_bar, textvariable=self.results_info_var).pack(side="right", padx=8)
+        self.filter_cue_entry.bind("<Return>", lambda _e: self.apply_results_filter())
+        self.filter_type_box.bind("<<ComboboxSelected>>", lambda _e: self.apply_results_filter())
+        self.filter_section_box.bind("<<ComboboxSelected>>", lambda _e: self.apply_results_filter())
+
+        self.results_tree = ttk.Treeview(results_frame, columns=RESULT_COLUMNS, show="headings")
+        widths = {"sentence": 520, "stance_type": 100, "cue": 90, "start": 50, "end": 50, "section": 160, "page": 50}
+        for col in RESULT_COLUMNS:
+            self.results_tree.heading(col, text=col, command=lambda c=col: self.sort_results(c))
+            self.results_tree.column(col, width=widths[col], stretch=(col == "sentence"),
+                                     anchor="w" if col in {"sentence", "section"} else "center")
+        self.results_scroll = ttk.Scrollbar(results_frame, orient="vertical", command=self.results_tree.yview)
+        self.results_tree.configure(yscrollcommand=self.results_scroll.set)
+        filter_bar.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(4,4))
+        self.results_tree.grid(row=1, column=0, sticky="nsew")
+        self.results_scroll.grid(row=1, column=1, sticky="ns")
+        results_frame.columnconfigure(0, weight=1)
+        results_frame.rowconfigure(1, weight=1)
+
+        self.output_tabs.add(log_frame, text="Log")
+        self.output_tabs.add(results_frame, text="Results")
+        self.results_tab = results_frame
+
+        conc_frame = ttk.Frame(self.output_tabs)
+        self.concordance = None
+        self.conc_index_var = tk.StringVar(value=os.path.join("output", "concordance.sqlite"))
+        self.conc_cue_var = tk.StringVar()
+        self.conc_type_var = tk.StringVar()
+        self.conc_text_var = tk.StringVar()
+        conc_bar = ttk.Frame(conc_frame)
+        ttk.Label(conc_bar, text="Index:").pack(side="left")
+        ttk.Entry(conc_bar, textvariable=self.conc_index_var, width=28).pack(side="left", padx=(2,8))
+        ttk.Label(conc_bar, text="Cue/lemma:").pack(side="left")
+        conc_cue_entry = ttk.Entry(conc_bar, textvariable=self.conc_cue_var, width=14)
+        conc_cue_entry.pack(side="left", padx=(2,8))
+        ttk.Label(conc_bar, text="Type:").pack(side="left")
+        ttk.Combobox(conc_bar, textvariable=self.conc_type_var, width=12, state="readonly",
+                     values=["", "hedging", "boosting", "attitude", "self_mention"]).pack(side="left", padx=(2,8))
+        ttk.Label(conc_bar, text="Text:").pack(side="left")
+        ttk.Entry(conc_bar, textvariable=self.conc_text_var, width=16).pack(side="left", padx=(2,8))
+        ttk.Button(conc_bar, text="Search", command=self.search_concordance).pack(side="left")
+        ttk.Button(conc_bar, text="Index Last Results", command=self.index_last_results).pack(side="right")
+        conc_cue_entry.bind("<Return>", lambda _e: self.search_concordance())
+        conc_cols = ("left", "keyword", "right", "document", "section", "page")
+        self.conc_tree = ttk.Treeview(conc_frame, columns=conc_cols, show="headings")
+        for col, width, anchor in (("left", 300, "e"), ("keyword", 90, "center"), ("right", 300, "w"),
+                                   ("document", 140, "w"), ("section", 120, "w"), ("page", 50, "center")):
+            self.conc_tree.heading(col, text=col)
+            self.conc_tree.column(col, width=width, anchor=anchor, stretch=col in {"left", "right"})
+        conc_scroll = ttk.Scrollbar(conc_frame, orient="vertical", command=self.conc_tree.yview)
+        self.conc_tree.configure(yscrollcommand=conc_scroll.set)
+        conc_bar.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(4,4))
+        self.conc_tree.grid(row=1, column=0, sticky="nsew")
+        conc_scroll.grid(row=1, column=1, sticky="ns")
+        conc_frame.columnconfigure(0, weight=1)
+        conc_frame.rowconfigure(1, weight=1)
+        self.output_tabs.add(conc_frame, text="Concordance")
 
         # =========== Layout root ===========
         pdf_frame.grid(row=0, column=0, columnspan=3, sticky="ew")
@@ -157,35 +503,95 @@ class StanceGUI(ttk.Frame):
         self.preview_button.grid(row=5, column=1, sticky="w", pady=(10,6))
         self.progress.grid(row=5, column=2, sticky="ew", pady=(10,6))
 
-        self.output_text.grid(row=6, column=0, columnspan=3, sticky="nsew", pady=(8,0))
-        self.output_scroll.grid(row=6, column=3, sticky="ns", pady=(8,0))
+        self.output_tabs.grid(row=6, column=0, columnspan=3, sticky="nsew", pady=(8,0))
 
-        self.status_label.grid(row=7, column=0, columnspan=3, sticky="w", pady=(8,0))
+        jobs_frame.grid(row=7, column=0, columnspan=3, sticky="ew", pady=(8,0))
+        self.status_label.grid(row=8, column=0, columnspan=2, sticky="w", pady=(8,0))
+        self.nlp_status_label.grid(row=8, column=2, sticky="e", pady=(8,0))
 
         self.columnconfigure(0, weight=1)
         self.rowconfigure(2, weight=1)
         self.rowconfigure(6, weight=2)
 
         self.last_markers = None
+        self.last_markers_name = None
+
+        self.jobs = JobManager(workers=2)
+        self.after(100, self._poll_jobs)
+        # Warm NLTK only once the window is drawn, so startup never waits on it
+        self.after_idle(self._start_warm_up)
+
+    def _start_warm_up(self):
+        ready = []
+
+        def worker(job):
+            def step(done, total, name):
+                ready.append(name)
+                job.report(done, total, name)
+            _nltk_warm_up(step)
+
+        def on_error(e):
+            self.nlp_status_var.set(f"NLP models: failed to load ({e})")
+
+        job = self.jobs.submit("Warm up NLP models", worker,
+                               on_done=lambda _r: self.nlp_status_var.set("NLP models: ready"),
+                               on_error=on_error)
+        self._warm_up_ready = ready
+        self._warm_up_job = job
+
+    # ===== Background jobs =====
+    def submit_job(self, name, fn, on_done=None, error_title="Error"):
+        """Queue fn(job) on the worker pool; on_done(result) runs on the Tk thread."""
+        def on_error(e):
+            messagebox.showerror(error_title, str(e))
+            self.status_var.set(f"{name} failed")
+        job = self.jobs.submit(name, fn, on_done=on_done, on_error=on_error)
+        self.jobs_tree.insert("", "end", iid=str(job.id), values=(f"#{job.id} {name}", job.status, ""))
+        return job
+
+    def _poll_jobs(self):
+        self.jobs.poll()
+        running = []
+        for job in self.jobs.jobs:
+            iid = str(job.id)
+            if not self.jobs_tree.exists(iid):
+                continue
+            detail = f"{job.done}/{job.total}" if job.total else ""
+            if job.message:
+                detail = f"{detail} {job.message}".strip()
+            self.jobs_tree.item(iid, values=(f"#{job.id} {job.name}", job.status, detail))
+            if job.status == "running":
+                running.append(job)
+        warm = getattr(self, "_warm_up_job", None)
+        if warm is not None and warm.status == "running":
+            loaded = ", ".join(self._warm_up_ready) or "none yet"
+            self.nlp_status_var.set(f"NLP models: loading... (ready: {loaded})")
+        running = [j for j in running if j is not warm]
+        if running:
+            # Determinate bar follows the oldest running job
+            self.progress["value"] = running[0].fraction * 100
+            self.status_var.set(f"{running[0].name}... ({len(self.jobs.active())} active)")
+        elif not self.jobs.active():
+            self.progress["value"] = 0
+        self.after(100, self._poll_jobs)
+
+    def cancel_selected_job(self):
+        for iid in self.jobs_tree.selection():
+            for job in self.jobs.jobs:
+                if str(job.id) == iid:
+                    job.cancel()
+
+    def cancel_all_jobs(self):
+        self.jobs.cancel_all()
 
     # ===== Common UI helpers =====
-    def set_busy(self, busy=True, status="Working..."):
-        if busy:
-            self.progress.start(10)
-            self.run_button.config(state="disabled")
-            self.preview_button.config(state="disabled")
-            self.status_var.set(status)
-        else:
-            self.progress.stop()
-            self.run_button.config(state="normal")
-            self.preview_button.config(state="normal")
-            self.status_var.set(status or "Ready")
 
     def write_output(self, text):
         self.output_text.config(state="normal")
         self.output_text.delete("1.0", "end")
         self.output_text.insert("end", text)
         self.output_text.config(state="disabled")
+        self.output_tabs.select(0)
 
     # ===== PDF Extraction =====
     def choose_pdf_dir(self):
@@ -201,19 +607,15 @@ class StanceGUI(ttk.Frame):
             return
         os.makedirs(out_dir, exist_ok=True)
 
-        def worker():
-            try:
-                extractor = PDFExtractor(directory=pdf_dir)
-                extractor.extract_multiple()
-            except Exception as e:
-                self.master.after(0, lambda: messagebox.showerror("Extraction error", str(e)))
-                self.master.after(0, lambda: self.set_busy(False, "Extraction failed"))
-                return
-            self.master.after(0, lambda: self.set_busy(False, f"Extraction completed."))
-            self.master.after(0, lambda: self.write_output(f"PDF extraction finished.\nSource: {pdf_dir}\nOutput dir: {out_dir}"))
+        def worker(job):
+            extractor = _pdf_extractor()(directory=pdf_dir, output_dir=out_dir)
+            extractor.extract_multiple(progress=lambda done, total, name: job.report(done, total, f"pages ({name})"))
+
+        def finish(_result):
+            self.status_var.set("Extraction completed.")
+            self.write_output(f"PDF extraction finished.\nSource: {pdf_dir}\nOutput dir: {out_dir}")
 
-        self.set_busy(True, "Extracting PDFs...")
-        Thread(target=worker, daemon=True).start()
+        self.submit_job("Extract PDFs", worker, on_done=finish, error_title="Extraction error")
 
     # ===== Divide into Sections =====
     def choose_thesis_text(self):
@@ -233,32 +635,22 @@ class StanceGUI(ttk.Frame):
 
         os.makedirs(out_dir, exist_ok=True)
 
-        def worker():
-            try:
-                # Pass the selected out_dir to the extractor
-                extractor = ThesisExtractor(thesis_path, out_dir=out_dir)
-
-                # Expect: list of (title, printed, pdf_page, file_path)
-                mapped = extractor.extract_sections()
-
-                # Store real file paths for the list/browser
-                files = [fp for (_t, _p, _pg, fp) in mapped]
-
-            except Exception as e:
-                self.master.after(0, lambda: messagebox.showerror("Section extraction error", str(e)))
-                self.master.after(0, lambda: self.set_busy(False, "Section extraction failed"))
-                return
+        def worker(job):
+            # Pass the selected out_dir to the extractor
+            extractor = ThesisExtractor(thesis_path, out_dir=out_dir)
+            job.check()
+            # Expect: list of (title, printed, pdf_page, file_path)
+            return extractor.extract_sections()
 
-            def finish():
-                self.section_map = [(t, p, pg) for (t, p, pg, _fp) in mapped]
-                self.section_files = files
-                self._populate_sections_list()
-                self.set_busy(False, f"Sections extracted: {len(mapped)}")
-                self.write_output(f"Extracted {len(mapped)} sections into '{out_dir}'.\nSelect a section to load or preview.")
-            self.master.after(0, finish)
+        def finish(mapped):
+            self.section_map = [(t, p, pg) for (t, p, pg, _fp) in mapped]
+            # Store real file paths for the list/browser
+            self.section_files = [fp for (_t, _p, _pg, fp) in mapped]
+            self._populate_sections_list()
+            self.status_var.set(f"Sections extracted: {len(mapped)}")
+            self.write_output(f"Extracted {len(mapped)} sections into '{out_dir}'.\nSelect a section to load or preview.")
 
-        self.set_busy(True, "Extracting sections...")
-        Thread(target=worker, daemon=True).start()
+        self.submit_job("Extract sections", worker, on_done=finish, error_title="Section extraction error")
 
     def _clean_title_to_filename(self, title: str) -> str:
         clean = re.sub(r"[^A-Za-z0-9_\- ]+", "", title).strip().replace(" ", "_")
@@ -329,69 +721,181 @@ class StanceGUI(ttk.Frame):
         if path:
             self.output_path_var.set(path)
 
-    def _detect_in_background(self, text, output_csv):
-        try:
-            detector = StanceDetector(text)
-            markers = detector.detect_stance_markers()
+    def _detect_job(self, job, path_in, output_csv, ai, service=None, strip_boilerplate=False):
+        job.report(0, 0, "reading input")
+        text = self._read_text_file(path_in)
+        if service:
+            # Models stay loaded in the service; only the text goes over the socket
+            job.report(0, 0, f"detecting via {service}")
+            from packages.detection_service import group_rows, write_rows_csv
+            rows = _detection_client(service).detect_rows(text, thesis_path=path_in, strip_boilerplate=strip_boilerplate)
             if output_csv:
-                # Ensure directory exists
-                os.makedirs(os.path.dirname(output_csv), exist_ok=True)
-                detector.export_to_csv(output_csv)
-
-            # Optional Gemini validation pass
-            if self.use_ai_validate_var.get() and gemini_validate_file is not None:
-                api_key = self.gemini_api_key_var.get().strip()
-                if api_key:
-                    os.environ["GEMINI_API_KEY"] = api_key
-                model_name = self.gemini_model_var.get().strip() or "gemini-1.5-pro"
-                base, ext = os.path.splitext(output_csv or "output.csv")
-                out_valid = f"{base}_validated{ext}"
-                out_audit = f"{base}_audit{ext}"
-                gemini_validate_file(output_csv, out_valid, out_audit, model_name=model_name)
+                write_rows_csv(rows, output_csv)
+            markers = group_rows(rows)
+            return self._validate_job(job, output_csv, ai, markers)
+        job.report(0, 0, "splitting sentences")
+        analysis = _analysis_cache()
+        try:
+            detector = _stance_detector()(text, strip_boilerplate=strip_boilerplate, analysis_cache=analysis)
+            # Whole file in one pass; page/section come from its page banners and TOC
+            markers = detector.detect_document(path_in, progress=lambda d, t: job.report(d, t, "sentences"))
+        finally:
+            analysis.close()
+        if output_csv:
+            # Ensure directory exists
+            os.makedirs(os.path.dirname(output_csv), exist_ok=True)
+            detector.export_to_csv(output_csv, results=markers)
+        return self._validate_job(job, output_csv, ai, markers)
+
+    def _validate_job(self, job, output_csv, ai, markers):
+        # Optional Gemini validation pass
+        if ai:
+            if ai["api_key"]:
+                os.environ["GEMINI_API_KEY"] = ai["api_key"]
+            base, ext = os.path.splitext(output_csv or "output.csv")
+            out_valid = f"{base}_validated{ext}"
+            out_audit = f"{base}_audit{ext}"
+            rows_cb = lambda d, t: job.report(d, t, "rows validated")
+            gemini_validate_file = _gemini_validate_file()
+            if gemini_validate_file is None:
+                raise RuntimeError("Gemini validator could not be imported; detection results were saved.")
+            if ai["tiered"]:
+                from packages.gemini_validator.config import FAST_MODEL
+                gemini_validate_file(output_csv, out_valid, out_audit, model_name=FAST_MODEL,
+                                     escalate_model=ai["model_name"], progress=rows_cb)
+            else:
+                gemini_validate_file(output_csv, out_valid, out_audit, model_name=ai["model_name"], progress=rows_cb)
+        return markers
 
-        except Exception as e:
-            self.master.after(0, lambda: messagebox.showerror("Error", str(e)))
-            self.master.after(0, lambda: self.set_busy(False, "Error"))
+    def run_detection(self):
+        path_in = self.input_path_var.get().strip()
+        path_out = self.output_path_var.get().strip()
+        if not path_in or not os.path.isfile(path_in):
+            messagebox.showwarning("Missing input", "Please select a valid input text file.")
             return
 
-        def finish():
+        # Tk variables are read here, on the main thread, never from the worker
+        ai = None
+        if self.use_ai_validate_var.get() and _gemini_available():
+            ai = {
+                "api_key": self.gemini_api_key_var.get().strip(),
+                "model_name": self.gemini_model_var.get().strip() or "gemini-1.5-pro",
+                "tiered": self.tiered_validate_var.get(),
+            }
+
+        def finish(markers):
             self.last_markers = markers
+            self.last_markers_name = os.path.splitext(os.path.basename(path_in))[0]
             n = len(markers) if markers else 0
             msg = f"Completed. {n} detections."
-            if self.use_ai_validate_var.get() and gemini_validate_file is not None:
+            if ai:
                 msg += " AI validation finished."
-            self.set_busy(False, msg)
+            self.status_var.set(msg)
             self.show_preview()
-        self.master.after(0, finish)
 
-    def run_detection(self):
-        path_in = self.input_path_var.get().strip()
-        path_out = self.output_path_var.get().strip()
-        if not path_in or not os.path.isfile(path_in):
-            messagebox.showwarning("Missing input", "Please select a valid input text file.")
+        service, strip = self.service_var.get().strip(), self.strip_boilerplate_var.get()
+        self.submit_job(f"Detect {os.path.basename(path_in)}",
+                        lambda job: self._detect_job(job, path_in, path_out, ai, service, strip), on_done=finish)
+
+    # ===== Concordance =====
+    def _get_concordance(self):
+        path = self.conc_index_var.get().strip() or os.path.join("output", "concordance.sqlite")
+        if self.concordance is None or self.concordance.path != path:
+            self.concordance = _concordance_index(path)
+        return self.concordance
+
+    def index_last_results(self):
+        if not self.last_markers:
+            messagebox.showinfo("Concordance", "Run stance detection first.")
             return
+        index = self._get_concordance()
+        name, markers = self.last_markers_name, self.last_markers
+        self.submit_job(f"Index {name}", lambda job: index.add_document(name, markers),
+                        on_done=lambda n: self.status_var.set(f"Indexed {n} markers from {name}."),
+                        error_title="Concordance error")
+
+    def search_concordance(self):
         try:
-            text = self._read_text_file(path_in)
+            index = self._get_concordance()
+            cue = self.conc_cue_var.get().strip()
+            filters = {"stance_type": self.conc_type_var.get(), "text": self.conc_text_var.get().strip()}
+            lines = index.kwic(cue or None, **filters) or (index.kwic(lemma=cue, **filters) if cue else [])
         except Exception as e:
-            messagebox.showerror("Read error", f"Failed to read input file:\n{e}")
+            messagebox.showerror("Concordance error", str(e))
             return
-
-        self.set_busy(True, "Running stance detection...")
-        Thread(target=self._detect_in_background, args=(text, path_out), daemon=True).start()
+        self.conc_tree.delete(*self.conc_tree.get_children())
+        for line in lines:
+            self.conc_tree.insert("", "end", values=(line["left"].strip(), line["keyword"], line["right"].strip(),
+                                                     line["document"], line["section"] or "",
+                                                     "" if line["page"] is None else line["page"]))
+        self.status_var.set(f"Concordance: {len(lines)} hit(s).")
 
     def show_preview(self):
         if not self.last_markers:
             self.write_output("No results yet. Click Run Stance Detection first.")
             return
-        n = max(1, int(self.preview_count_var.get() or 5))
-        lines = []
-        for m in self.last_markers[:n]:
-            sent = m.get("sentence", "")
-            tags = m.get("markers", [])
-            lines.append(sent)
-            lines.append(f"→ {tags}")
-            lines.append("")
-        self.write_output("\n".join(lines))
+        self.load_results(ResultsModel.from_markers(self.last_markers))
+
+    # ===== Results table =====
+    def load_results(self, model):
+        self.results_model = model
+        self.results_sort = (None, False)
+        self.filter_type_box.configure(values=[""] + model.distinct("stance_type"))
+        self.filter_section_box.configure(values=[""] + [str(s) for s in model.distinct("section")])
+        self.output_tabs.select(self.results_tab)
+        self.apply_results_filter()
+
+    def open_results_csv(self):
+        path = filedialog.askopenfilename(
+            title="Open stance CSV",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if path:
+            self.submit_job(f"Load {os.path.basename(path)}", lambda job: ResultsModel.from_csv(path),
+                            on_done=self.load_results, error_title="Read error")
+
+    def apply_results_filter(self):
+        # Debounced: a burst of filter/sort clicks runs one selection, on a worker thread
+        if self._filter_after is not None:
+            self.after_cancel(self._filter_after)
+        self._filter_after = self.after(150, self._run_results_filter)
+
+    def _run_results_filter(self):
+        self._filter_after = None
+        if self._filter_job is not None:
+            self._filter_job.cancel()
+        model, (column, descending) = self.results_model, self.results_sort
+        args = (self.filter_type_var.get(), self.filter_cue_var.get(), self.filter_section_var.get(), column, descending)
+
+        def on_done(view):
+            # Drop results that a newer filter or a newly loaded table has superseded
+            if job is self._filter_job and model is self.results_model:
+                model.view = view
+                self.goto_results_page(0)
+
+        self.results_info_var.set("Filtering...")
+        job = self._filter_job = self.jobs.submit("Filter results", lambda _job: model.select(*args),
+                                                  on_done=on_done, on_error=lambda e: self.results_info_var.set(str(e)))
+
+    def sort_results(self, column):
+        prev, descending = self.results_sort
+        self.results_sort = (column, not descending if prev == column else False)
+        self.apply_results_filter()
+
+    def goto_results_page(self, number):
+        try:
+            size = max(1, int(self.preview_count_var.get() or 200))
+        except (tk.TclError, ValueError):
+            size = 200
+        total = len(self.results_model.view)
+        last = max(0, (total - 1) // size)
+        self.results_page = min(max(0, number), last)
+        self.results_tree.delete(*self.results_tree.get_children())
+        for row in self.results_model.page(self.results_page, size):
+            self.results_tree.insert("", "end", values=["" if v is None else v for v in row])
+        first = self.results_page * size
+        self.results_info_var.set(f"{first + 1 if total else 0}–{min(first + size, total)} of {total}"
+                                  f" (page {self.results_page + 1}/{last + 1})")
 
     def preview_detections(self):
         self.show_preview()
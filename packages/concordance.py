@@ -0,0 +1,252 @@
+# packages/concordance.py
+import argparse, csv, os, re, sqlite3
+from threading import Lock
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sentences (
+    id INTEGER PRIMARY KEY,
+    doc_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    section TEXT,
+    page INTEGER,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS markers (
+    id INTEGER PRIMARY KEY,
+    sentence_id INTEGER NOT NULL REFERENCES sentences(id) ON DELETE CASCADE,
+    doc_id INTEGER NOT NULL,
+    stance_type TEXT NOT NULL,
+    cue TEXT NOT NULL,
+    lemma TEXT NOT NULL,
+    start INTEGER,
+    end INTEGER,
+    char_start INTEGER,
+    char_end INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_markers_cue ON markers(cue, stance_type);
+CREATE INDEX IF NOT EXISTS ix_markers_lemma ON markers(lemma, stance_type);
+CREATE INDEX IF NOT EXISTS ix_markers_type ON markers(stance_type);
+CREATE INDEX IF NOT EXISTS ix_markers_doc ON markers(doc_id);
+CREATE INDEX IF NOT EXISTS ix_sentences_doc ON sentences(doc_id, section, page);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS sentences_fts USING fts5(text, content='sentences', content_rowid='id');
+"""
+
+def _default_lemmatizer():
+    try:
+        from packages.nltk_stance.preprocessor import get_lemmatizer
+        wnl = get_lemmatizer()
+        wnl.lemmatize("warming", pos="v")
+    except Exception:
+        return lambda cue: cue
+    return lambda cue: cue if " " in cue else wnl.lemmatize(cue, pos="v")
+
+def locate_cue(sentence: str, cue: str, token_start=None):
+    """
+    Character span of `cue` in `sentence`. Detector offsets are token indices, so among all
+    whole-word matches the one preceded by about `token_start` words is chosen.
+    """
+    words = r"\s+".join(re.escape(w) for w in cue.split())
+    matches = list(re.finditer(rf"(?<!\w){words}(?!\w)", sentence, re.IGNORECASE))
+    if not matches:
+        return None, None
+    if token_start is None:
+        best = matches[0]
+    else:
+        best = min(matches, key=lambda m: abs(len(re.findall(r"\w+|[^\w\s]", sentence[:m.start()])) - int(token_start)))
+    return best.start(), best.end()
+
+class ConcordanceIndex:
+    """
+    On-disk inverted index of detected markers (SQLite). Markers are indexed by cue, lemma,
+    stance type, document, section and page, and sentence text is full-text indexed (FTS5
+    when available), so keyword-in-context queries stay in the millisecond range across the
+    corpus. Documents are added incrementally; re-adding a document replaces it.
+    """
+
+    def __init__(self, path: str = "output/concordance.sqlite", lemmatize=None):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = Lock()
+        self._lemmatize = lemmatize
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # ---------- Ingestion ----------
+    @staticmethod
+    def _rows_from_csv(path):
+        # Regroup one-row-per-marker CSVs into detect_stance_markers() shape
+        results, by_key = [], {}
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for rec in csv.DictReader(f):
+                key = (rec.get("sentence", ""), rec.get("section") or None, rec.get("page") or None)
+                item = by_key.get(key)
+                if item is None:
+                    item = by_key[key] = {"sentence": key[0], "section": key[1], "page": key[2], "markers": []}
+                    results.append(item)
+                item["markers"].append({"stance_type": rec["stance_type"], "cue": rec["cue"],
+                                        "start": rec.get("start"), "end": rec.get("end")})
+        return results
+
+    def add_document(self, name: str, results) -> int:
+        """Index detect_stance_markers() output or a stance CSV path under `name`; returns markers added."""
+        if isinstance(results, (str, os.PathLike)):
+            results = self._rows_from_csv(results)
+        if self._lemmatize is None:
+            self._lemmatize = _default_lemmatizer()
+        n = 0
+        with self._lock, self.conn:
+            self._remove(name)
+            doc_id = self.conn.execute("INSERT INTO documents(name) VALUES (?)", (name,)).lastrowid
+            for item in results:
+                page = item.get("page")
+                sent_id = self.conn.execute(
+                    "INSERT INTO sentences(doc_id, section, page, text) VALUES (?, ?, ?, ?)",
+                    (doc_id, item.get("section"), int(page) if page not in (None, "") else None, item["sentence"])).lastrowid
+                if self.fts:
+                    self.conn.execute("INSERT INTO sentences_fts(rowid, text) VALUES (?, ?)", (sent_id, item["sentence"]))
+                rows = []
+                for m in item["markers"]:
+                    cue = str(m["cue"]).lower()
+                    cs, ce = locate_cue(item["sentence"], cue, m.get("start"))
+                    rows.append((sent_id, doc_id, m["stance_type"], cue, self._lemmatize(cue),
+                                 m.get("start"), m.get("end"), cs, ce))
+                self.conn.executemany(
+                    "INSERT INTO markers(sentence_id, doc_id, stance_type, cue, lemma, start, end, char_start, char_end)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                n += len(rows)
+        return n
+
+    def _remove(self, name):
+        row = self.conn.execute("SELECT id FROM documents WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return
+        if self.fts:
+            self.conn.execute(
+                "INSERT INTO sentences_fts(sentences_fts, rowid, text) "
+                "SELECT 'delete', id, text FROM sentences WHERE doc_id = ?", (row[0],))
+        self.conn.execute("DELETE FROM markers WHERE doc_id = ?", (row[0],))
+        self.conn.execute("DELETE FROM sentences WHERE doc_id = ?", (row[0],))
+        self.conn.execute("DELETE FROM documents WHERE id = ?", (row[0],))
+
+    def remove_document(self, name: str):
+        with self._lock, self.conn:
+            self._remove(name)
+
+    def documents(self):
+        with self._lock:
+            return [r[0] for r in self.conn.execute("SELECT name FROM documents ORDER BY name")]
+
+    # ---------- Queries ----------
+    def query(self, cue=None, lemma=None, stance_type=None, document=None, section=None, page=None,
+              text=None, raw_fts=False, limit=200):
+        """
+        Markers matching every given filter, as dicts with the sentence, its location and the
+        cue's character span. `text` is matched as a phrase over sentence text (substring match
+        when FTS5 is unavailable); with raw_fts it is passed through as FTS5 query syntax.
+        An invalid query raises ValueError.
+        """
+        where, args = [], []
+        for col, val in (("m.cue", cue), ("m.lemma", lemma), ("m.stance_type", stance_type),
+                         ("d.name", document), ("s.section", section), ("s.page", page)):
+            if val not in (None, ""):
+                where.append(f"{col} = ?")
+                args.append(val.lower() if col in {"m.cue", "m.lemma"} else val)
+        if text:
+            if self.fts:
+                where.append("s.id IN (SELECT rowid FROM sentences_fts WHERE sentences_fts MATCH ?)")
+                # Quoted as one FTS5 phrase so input like don't, results-based or p.5 is not parsed as syntax
+                args.append(text if raw_fts else '"' + text.replace('"', '""') + '"')
+            else:
+                where.append("s.text LIKE ?")
+                args.append(f"%{text}%")
+        sql = ("SELECT d.name, s.section, s.page, m.stance_type, m.cue, m.lemma, s.text, m.char_start, m.char_end"
+               " FROM markers m JOIN sentences s ON s.id = m.sentence_id JOIN documents d ON d.id = m.doc_id")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY d.name, s.id, m.char_start LIMIT ?"
+        args.append(int(limit))
+        keys = ("document", "section", "page", "stance_type", "cue", "lemma", "sentence", "char_start", "char_end")
+        with self._lock:
+            try:
+                return [dict(zip(keys, r)) for r in self.conn.execute(sql, args)]
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Invalid text query {text!r}: {e}") from None
+
+    def kwic(self, cue=None, width: int = 50, **filters):
+        """Keyword-in-context lines: dicts with left, keyword and right context plus location."""
+        lines = []
+        for hit in self.query(cue=cue, **filters):
+            sent, cs, ce = hit["sentence"], hit["char_start"], hit["char_end"]
+            if cs is None:
+                cs, ce = 0, 0
+            lines.append({
+                "document": hit["document"], "section": hit["section"], "page": hit["page"],
+                "stance_type": hit["stance_type"],
+                "left": sent[max(0, cs - width):cs].rjust(width),
+                "keyword": sent[cs:ce] or hit["cue"],
+                "right": sent[ce:ce + width].ljust(width),
+            })
+        return lines
+
+    def cue_counts(self, stance_type=None):
+        sql = "SELECT cue, stance_type, COUNT(*) FROM markers"
+        args = []
+        if stance_type:
+            sql += " WHERE stance_type = ?"
+            args.append(stance_type)
+        sql += " GROUP BY cue, stance_type ORDER BY COUNT(*) DESC"
+        with self._lock:
+            return self.conn.execute(sql, args).fetchall()
+
+def main():
+    p = argparse.ArgumentParser(description="Concordance index over detected stance markers")
+    p.add_argument("--index", default="output/concordance.sqlite", help="SQLite index path")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    add = sub.add_parser("add", help="Index stance CSVs (document name = file name)")
+    add.add_argument("csv", nargs="+")
+    q = sub.add_parser("kwic", help="Keyword-in-context query")
+    q.add_argument("cue", nargs="?", default=None)
+    q.add_argument("--lemma")
+    q.add_argument("--type", dest="stance_type")
+    q.add_argument("--doc", dest="document")
+    q.add_argument("--section")
+    q.add_argument("--page", type=int)
+    q.add_argument("--text", help="Phrase to find in sentences")
+    q.add_argument("--raw-fts", action="store_true", help="Treat --text as FTS5 query syntax (AND, OR, NEAR, prefix*)")
+    q.add_argument("--limit", type=int, default=50)
+    args = p.parse_args()
+
+    index = ConcordanceIndex(args.index)
+    if args.cmd == "add":
+        for path in args.csv:
+            name = os.path.splitext(os.path.basename(path))[0]
+            print(f"{name}: {index.add_document(name, path)} markers")
+        return
+    try:
+        lines = index.kwic(args.cue, lemma=args.lemma, stance_type=args.stance_type, document=args.document,
+                           section=args.section, page=args.page, text=args.text, raw_fts=args.raw_fts,
+                           limit=args.limit)
+    except ValueError as e:
+        p.exit(2, f"error: {e}\n")
+    for line in lines:
+        print(f"{line['left']} [{line['keyword']}] {line['right']}  ({line['document']}, p.{line['page']})")
+
+if __name__ == "__main__":
+    main()
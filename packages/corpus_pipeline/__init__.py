@@ -0,0 +1,3 @@
+# packages/corpus_pipeline/__init__.py
+from .pipeline import run_pipeline
+__all__ = ["run_pipeline"]
@@ -0,0 +1,58 @@
+# packages/corpus_pipeline/artifacts.py
+import os, json, hashlib
+from pathlib import Path
+
+PACKAGES_DIR = Path(__file__).resolve().parent.parent
+
+def hash_file(path, chunk_size=1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def code_version(*relative_paths) -> str:
+    """Hash of the given source files under packages/, so editing code or lexicon invalidates a stage."""
+    h = hashlib.sha256()
+    for rel in relative_paths:
+        h.update(rel.encode("utf-8"))
+        h.update((PACKAGES_DIR / rel).read_bytes())
+    return h.hexdigest()[:16]
+
+class ArtifactCache:
+    """
+    Content-addressed stage outputs: <root>/<stage>/<key>/ holds the files a stage wrote and
+    a manifest.json that is only written once the stage finished, so a crashed or interrupted
+    run never leaves a half-written artifact that looks valid.
+    """
+
+    def __init__(self, root: str = ".pipeline_cache"):
+        self.root = Path(root)
+
+    @staticmethod
+    def key(*parts) -> str:
+        h = hashlib.sha256()
+        for p in parts:
+            h.update(json.dumps(p, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()[:32]
+
+    def dir(self, stage: str, key: str) -> Path:
+        path = self.root / stage / key
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def get(self, stage: str, key: str):
+        manifest = self.root / stage / key / "manifest.json"
+        if not manifest.exists():
+            return None
+        with open(manifest, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def put(self, stage: str, key: str, manifest: dict) -> dict:
+        path = self.dir(stage, key) / "manifest.json"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        return manifest
@@ -0,0 +1,42 @@
+# packages/corpus_pipeline/cli.py
+import argparse
+from .pipeline import run_pipeline
+
+def main():
+    p = argparse.ArgumentParser(description="Run extraction, sectioning, stance detection and optional Gemini validation over a directory")
+    p.add_argument("input_dir", help="Folder with PDFs and/or extracted .txt files")
+    p.add_argument("--out", dest="out_dir", default="output", help="Where the per-document CSVs are written")
+    p.add_argument("--cache", dest="cache_dir", default=".pipeline_cache", help="Stage artifact cache directory")
+    p.add_argument("--no-sections", dest="use_sections", action="store_false",
+                   help="Ignore the TOC: no section attribution, front matter included")
+    p.add_argument("--validate", action="store_true", help="Run Gemini validation on each stance CSV")
+    p.add_argument("--model", dest="model_name", default=None, help="Gemini model")
+    p.add_argument("--escalate-model", dest="escalate_model", default=None, help="Tiered validation: strong model")
+    p.add_argument("--mode", choices=["full", "sample"], default="full", help="Validation mode")
+    p.add_argument("--prefetch", type=int, default=2, help="Documents extracted ahead of detection")
+    p.add_argument("--workers", type=int, default=None, help="Processes for segmenting/tagging one large document")
+    p.add_argument("--strip-boilerplate", action="store_true", help="Remove running headers/footers before detection")
+    args = p.parse_args()
+
+    options = {"mode": args.mode}
+    if args.model_name:
+        options["model_name"] = args.model_name
+    elif args.escalate_model:
+        from packages.gemini_validator.config import FAST_MODEL
+        options["model_name"] = FAST_MODEL
+    if args.escalate_model:
+        options["escalate_model"] = args.escalate_model
+
+    try:
+        summary = run_pipeline(args.input_dir, args.out_dir, args.cache_dir, use_sections=args.use_sections,
+                               validate=args.validate, validate_options=options, prefetch=args.prefetch, workers=args.workers,
+                               strip_boilerplate=args.strip_boilerplate)
+    except ValueError as e:
+        raise SystemExit(f"error: {e}")
+    failed = [s["document"] for s in summary if s["status"] != "ok"]
+    print(f"\n{len(summary) - len(failed)}/{len(summary)} documents processed.")
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# packages/corpus_pipeline/pipeline.py
+import os, shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .artifacts import ArtifactCache, hash_file, code_version
+
+EXTRACT_CODE = ("pdf_to_text.py",)
+SECTION_CODE = ("extractor.py",)
+DETECT_CODE = ("nltk_stance/preprocessor.py", "nltk_stance/stance_detector.py", "nltk_stance/stance_lexicon.py",
+               "nltk_stance/results.py", "nltk_stance/attribution.py", "nltk_stance/boilerplate.py", "nltk_stance/analysis_cache.py")
+VALIDATE_CODE = ("gemini_validator/validator.py", "gemini_validator/prompt.py", "gemini_validator/config.py",
+                 "gemini_validator/sampling.py")
+
+def list_documents(input_dir: str):
+    """
+    PDFs and already-extracted .txt files in input_dir, sorted by name. Outputs are named after
+    the file stem, so two documents with the same stem (thesis.pdf and thesis.txt) raise ValueError.
+    """
+    docs = sorted(str(p) for p in Path(input_dir).iterdir()
+                  if p.is_file() and p.suffix.lower() in {".pdf", ".txt"})
+    seen = {}
+    for doc in docs:
+        seen.setdefault(Path(doc).stem, []).append(Path(doc).name)
+    clashes = ["/".join(names) for names in seen.values() if len(names) > 1]
+    if clashes:
+        raise ValueError(f"documents would overwrite each other's outputs: {', '.join(clashes)}")
+    return docs
+
+# ---------- Stages ----------
+def _extract_stage(cache: ArtifactCache, doc_path: str) -> str:
+    if not doc_path.lower().endswith(".pdf"):
+        return doc_path
+    from packages.pdf_to_text import PDFExtractor
+    key = cache.key(hash_file(doc_path), code_version(*EXTRACT_CODE))
+    hit = cache.get("extract", key)
+    if hit is None:
+        out_dir = cache.dir("extract", key)
+        out = PDFExtractor.extract_text(doc_path, str(out_dir))
+        hit = cache.put("extract", key, {"text": os.path.basename(out)})
+    return str(cache.root / "extract" / key / hit["text"])
+
+def _section_stage(cache: ArtifactCache, text_path: str, text_hash: str, use_sections: bool):
+    """
+    The TOC map as {"toc": [[title, printed, pdf_page]], "page_map": [[printed, pdf_page]]}, or
+    None when sections are off. Only the map is kept; no section files are written.
+    """
+    if not use_sections:
+        return None
+    from packages import ThesisExtractor
+    key = cache.key(text_hash, code_version(*SECTION_CODE))
+    hit = cache.get("sections", key)
+    if hit is None:
+        extractor = ThesisExtractor(text_path)
+        toc = extractor.build_map()
+        hit = cache.put("sections", key, {"toc": [list(t) for t in toc],
+                                          "page_map": sorted(extractor.page_map.items())})
+    return hit
+
+def _detect_stage(cache: ArtifactCache, text_path: str, text_hash: str, sections: dict = None,
+                  workers: int = None, strip_boilerplate: bool = False) -> str:
+    """
+    One detection pass over the whole text; page and section are attributed per sentence from
+    the section stage's TOC map. With a TOC, sentences before its first section (front matter,
+    the TOC page itself) are dropped, as when detection ran on section files only.
+    """
+    key = cache.key(text_hash, sections, strip_boilerplate, code_version(*DETECT_CODE))
+    hit = cache.get("detect", key)
+    if hit is None:
+        from packages.nltk_stance import StanceDetector, AnalysisCache, PageIndex, write_results_csv
+        with open(text_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        # Token/tag/lemma cache shared by all documents: a lexicon edit reruns matching only
+        analysis = AnalysisCache(str(cache.root / "analysis.sqlite"))
+        try:
+            detector = StanceDetector(text, strip_boilerplate=strip_boilerplate, analysis_cache=analysis, workers=workers)
+            results = detector.detect_compact()
+        finally:
+            analysis.close()
+        toc = (sections or {}).get("toc")
+        if toc:
+            page_map = {printed: pdf for printed, pdf in sections["page_map"]}
+            results = results.attribute(PageIndex(detector.clean_text, toc, page_map))
+            results = results.filter(lambda s: s.section is not None)
+        else:
+            results = results.attribute(PageIndex(detector.clean_text))
+        out = cache.dir("detect", key) / "stance.csv"
+        write_results_csv(results, str(out))
+        hit = cache.put("detect", key, {"csv": out.name, "sentences_with_markers": len(results)})
+    return str(cache.root / "detect" / key / hit["csv"])
+
+def _validate_stage(cache: ArtifactCache, csv_path: str, options: dict):
+    key = cache.key(hash_file(csv_path), options, code_version(*VALIDATE_CODE))
+    hit = cache.get("validate", key)
+    if hit is None:
+        from packages.gemini_validator import validate_file
+        out_dir = cache.dir("validate", key)
+        validate_file(csv_path, str(out_dir / "validated.csv"), str(out_dir / "audit.csv"),
+                      report_csv=str(out_dir / "estimate.csv"), **options)
+        files = [n for n in ("validated.csv", "audit.csv", "estimate.csv") if (out_dir / n).exists()]
+        hit = cache.put("validate", key, {"files": files})
+    return [str(cache.root / "validate" / key / n) for n in hit["files"]]
+
+def _prepare(cache_dir: str, doc: str, use_sections: bool):
+    """Extraction and sectioning for one document; runs in a worker process."""
+    cache = ArtifactCache(cache_dir)
+    text_path = _extract_stage(cache, doc)
+    text_hash = hash_file(text_path)
+    return text_path, text_hash, _section_stage(cache, text_path, text_hash, use_sections)
+
+# ---------- Driver ----------
+def run_pipeline(input_dir: str, out_dir: str = "output", cache_dir: str = ".pipeline_cache",
+                 use_sections: bool = True, validate: bool = False, validate_options: dict = None,
+                 prefetch: int = 2, workers: int = None, strip_boilerplate: bool = False, log=print):
+    """
+    PDF extraction -> ThesisExtractor sectioning -> StanceDetector -> optional Gemini validation
+    for every PDF/.txt in input_dir. Up to `prefetch` documents are extracted and sectioned ahead of
+    the detection loop in worker processes (both stages are CPU-bound and would only interleave
+    under the GIL as threads), so extracting document N+1 overlaps detecting N.
+    Every stage output is cached under a hash of its inputs and of the code that produced it, so a
+    rerun only recomputes what changed. With `workers` > 1, each large document is itself segmented
+    and tagged in that many processes (same output as the sequential path); strip_boilerplate removes
+    running headers/footers before detection. Results are copied to
+    out_dir as <doc>_stance.csv (and <doc>_validated.csv / _audit.csv / _estimate.csv). Returns one summary dict per document.
+    """
+    documents = list_documents(input_dir)
+    cache = ArtifactCache(cache_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    pending = iter(documents)
+    ahead = deque()
+    summary = []
+    with ProcessPoolExecutor(max_workers=max(1, prefetch)) as pool:
+
+        def refill():
+            while len(ahead) < max(1, prefetch):
+                doc = next(pending, None)
+                if doc is None:
+                    return
+                ahead.append((doc, pool.submit(_prepare, str(cache_dir), doc, use_sections)))
+
+        refill()
+        while ahead:
+            doc, future = ahead.popleft()
+            refill()
+            summary.append(_finish_document(cache, doc, future, out_dir, validate, validate_options, workers,
+                                            strip_boilerplate, log))
+    return summary
+
+def _finish_document(cache, doc, future, out_dir, validate, validate_options, workers, strip_boilerplate, log):
+    """Detection (and validation) for one prepared document; returns its summary dict."""
+    name = Path(doc).stem
+    try:
+        text_path, text_hash, sections = future.result()
+    except Exception as e:
+        log(f"[FAIL] {name}: {type(e).__name__}: {e}")
+        return {"document": name, "status": "failed", "error": str(e)}
+    try:
+        stance_csv = os.path.join(out_dir, f"{name}_stance.csv")
+        shutil.copyfile(_detect_stage(cache, text_path, text_hash, sections, workers, strip_boilerplate), stance_csv)
+        outputs = [stance_csv]
+        if validate:
+            for src in _validate_stage(cache, stance_csv, validate_options or {}):
+                dst = os.path.join(out_dir, f"{name}_{Path(src).name}")
+                shutil.copyfile(src, dst)
+                outputs.append(dst)
+    except Exception as e:
+        log(f"[FAIL] {name}: {type(e).__name__}: {e}")
+        return {"document": name, "status": "failed", "error": str(e)}
+    n_sections = len(sections["toc"]) if sections else 0
+    log(f"[OK] {name}: {n_sections} TOC section(s) -> {', '.join(outputs)}")
+    return {"document": name, "status": "ok", "sections": n_sections, "outputs": outputs}
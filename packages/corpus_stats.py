@@ -0,0 +1,169 @@
+# packages/corpus_stats.py
+import os, re
+import numpy as np
+import pandas as pd
+
+UNKNOWN_PAGE = -1
+PAGE_BANNER = re.compile(r"^[ \t]*---\s*page\s*(\d+)\s*---[ \t]*$", re.IGNORECASE | re.MULTILINE)
+MARKER_COLS = ["document", "section", "page", "stance_type", "cue"]
+
+def page_word_counts(text: str, section: str = "", index=None) -> pd.DataFrame:
+    """
+    Words per PDF page, using the '--- Page N ---' banners written by PDFExtractor.
+    Text before the first banner (or text without banners) is counted under UNKNOWN_PAGE.
+    With `index` (a PageIndex), each page is counted under the section index.section(page)
+    assigns it, the same page -> section mapping the detector uses for markers.
+    """
+    pieces = PAGE_BANNER.split(text)
+    pages = np.array([UNKNOWN_PAGE] + [int(n) for n in pieces[1::2]], dtype=np.int64)
+    bodies = [pieces[0]] + pieces[2::2]
+    words = np.fromiter((len(b.split()) for b in bodies), dtype=np.int64, count=len(bodies))
+    if index is not None:
+        section = [index.section(None if p == UNKNOWN_PAGE else int(p)) or "" for p in pages]
+    df = pd.DataFrame({"section": section or "", "page": pages, "words": words})
+    return df[df["words"] > 0].groupby(["section", "page"], as_index=False)["words"].sum()
+
+def load_markers(source, document: str) -> pd.DataFrame:
+    """
+    Marker rows as columns (document, section, page, stance_type, cue) from a stance CSV path,
+    a DataFrame in that schema, or detect_stance_markers() output. Missing section becomes ""
+    and missing page UNKNOWN_PAGE so they group like any other value.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        df = pd.read_csv(source, usecols=lambda c: c in {"stance_type", "cue", "section", "page"})
+    elif isinstance(source, pd.DataFrame):
+        df = source
+    elif hasattr(source, "rows"):
+        # DetectionResults: flat (sentence, stance_type, cue, start, end, section, page) tuples
+        df = pd.DataFrame([(r[5], r[6], r[1], r[2]) for r in source.rows()],
+                          columns=["section", "page", "stance_type", "cue"])
+    else:
+        flat = [(item.get("section"), item.get("page"), m["stance_type"], m["cue"])
+                for item in source for m in item["markers"]]
+        df = pd.DataFrame(flat, columns=["section", "page", "stance_type", "cue"])
+    out = pd.DataFrame({
+        "document": document,
+        "section": df["section"].fillna("").astype(str) if "section" in df else "",
+        "page": pd.to_numeric(df["page"], errors="coerce").fillna(UNKNOWN_PAGE).astype(np.int64) if "page" in df else UNKNOWN_PAGE,
+        "stance_type": df["stance_type"].astype(str),
+        "cue": df["cue"].astype(str).str.lower(),
+    }, index=df.index)
+    return out.astype({"stance_type": "category", "cue": "category"})
+
+class CorpusStats:
+    """
+    Corpus-level stance statistics kept as grouped count tables rather than marker rows:
+    type counts per (document, section, page, stance_type), cue counts per
+    (document, stance_type, cue) and word counts per (document, section, page). Adding a
+    document is one groupby over its markers plus an index-aligned add, so aggregates grow
+    incrementally and reports never rescan the corpus. Any stance type is accepted.
+    """
+
+    def __init__(self):
+        self.type_counts = pd.Series(dtype=np.int64)
+        self.cue_counts = pd.Series(dtype=np.int64)
+        self.words = pd.Series(dtype=np.int64)
+        self.documents = set()
+
+    # ---------- Ingestion ----------
+    @staticmethod
+    def _merge(total: pd.Series, part: pd.Series) -> pd.Series:
+        if total.empty:
+            return part.astype(np.int64)
+        return total.add(part, fill_value=0).astype(np.int64)
+
+    @staticmethod
+    def _drop(total: pd.Series, document: str) -> pd.Series:
+        if total.empty:
+            return total
+        return total[total.index.get_level_values("document") != document]
+
+    def add_document(self, document: str, markers, texts=None, thesis_path: str = None, index=None):
+        """
+        Add (or replace) one document. `markers` is anything load_markers() accepts; `texts` is the
+        document text, or {section: text} for section files, used for the per-1,000-word norms.
+        A whole-document text is split into sections by `index` (a PageIndex), or by one built from
+        thesis_path's TOC, so per_section() norms line up with detect_document() markers.
+        """
+        if document in self.documents:
+            self.type_counts = self._drop(self.type_counts, document)
+            self.cue_counts = self._drop(self.cue_counts, document)
+            self.words = self._drop(self.words, document)
+        self.documents.add(document)
+
+        m = load_markers(markers, document)
+        self.type_counts = self._merge(self.type_counts,
+                                       m.groupby(["document", "section", "page", "stance_type"], observed=True).size())
+        self.cue_counts = self._merge(self.cue_counts,
+                                      m.groupby(["document", "stance_type", "cue"], observed=True).size())
+
+        if texts is not None:
+            if isinstance(texts, str):
+                if index is None and thesis_path:
+                    from packages.nltk_stance.attribution import PageIndex
+                    index = PageIndex.from_thesis(texts, thesis_path)
+                texts = {"": texts}
+            w = pd.concat([page_word_counts(t, s, index if not s else None) for s, t in texts.items()],
+                          ignore_index=True)
+            w = w.assign(document=document).groupby(["document", "section", "page"])["words"].sum()
+            self.words = self._merge(self.words, w)
+
+    # ---------- Reports ----------
+    def _per_1k(self, levels) -> pd.DataFrame:
+        counts = self.type_counts.groupby(level=levels + ["stance_type"]).sum().unstack("stance_type", fill_value=0)
+        if self.words.empty:
+            words = pd.Series(np.nan, index=counts.index)
+        else:
+            words = self.words.groupby(level=levels).sum().reindex(counts.index)
+        freq = counts.div(words.where(words > 0), axis=0) * 1000
+        freq.columns = [f"{c}_per_1k" for c in freq.columns]
+        return pd.concat([counts, freq], axis=1).assign(words=words)
+
+    def per_document(self) -> pd.DataFrame:
+        return self._per_1k(["document"])
+
+    def per_section(self) -> pd.DataFrame:
+        return self._per_1k(["document", "section"])
+
+    def per_page(self) -> pd.DataFrame:
+        return self._per_1k(["document", "page"])
+
+    def cue_distribution(self) -> pd.DataFrame:
+        """Corpus count of every cue and its share within its stance type."""
+        counts = self.cue_counts.groupby(level=["stance_type", "cue"]).sum()
+        counts = counts[counts > 0]
+        totals = counts.groupby(level="stance_type").transform("sum")
+        return pd.DataFrame({"count": counts, "share": counts / totals}).sort_values(
+            ["count"], ascending=False, kind="stable")
+
+    def type_ratios(self) -> pd.DataFrame:
+        """Per-document share of each stance type, plus the hedging:boosting ratio."""
+        counts = self.type_counts.groupby(level=["document", "stance_type"]).sum().unstack("stance_type", fill_value=0)
+        shares = counts.div(counts.sum(axis=1).where(lambda s: s > 0), axis=0)
+        shares.columns = [f"{c}_share" for c in shares.columns]
+        if "hedging" in counts and "boosting" in counts:
+            shares["hedging_to_boosting"] = counts["hedging"] / counts["boosting"].where(counts["boosting"] > 0)
+        return shares
+
+    def write_report(self, out_dir: str = "output/corpus_stats"):
+        os.makedirs(out_dir, exist_ok=True)
+        self.per_document().to_csv(os.path.join(out_dir, "per_document.csv"))
+        self.per_section().to_csv(os.path.join(out_dir, "per_section.csv"))
+        self.per_page().to_csv(os.path.join(out_dir, "per_page.csv"))
+        self.cue_distribution().to_csv(os.path.join(out_dir, "cues.csv"))
+        self.type_ratios().to_csv(os.path.join(out_dir, "type_ratios.csv"))
+
+    # ---------- Persistence ----------
+    def save(self, path: str):
+        pd.to_pickle({"type_counts": self.type_counts, "cue_counts": self.cue_counts,
+                      "words": self.words, "documents": self.documents}, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CorpusStats":
+        state = pd.read_pickle(path)
+        stats = cls()
+        stats.type_counts = state["type_counts"]
+        stats.cue_counts = state["cue_counts"]
+        stats.words = state["words"]
+        stats.documents = set(state["documents"])
+        return stats
@@ -0,0 +1,5 @@
+# packages/detection_service/__init__.py
+from .server import DetectionService, make_server, serve, DEFAULT_ADDRESS
+from .client import DetectionClient, ServiceError, group_rows, write_rows_csv
+__all__ = ["DetectionService", "make_server", "serve", "DEFAULT_ADDRESS", "DetectionClient", "ServiceError",
+           "group_rows", "write_rows_csv"]
@@ -0,0 +1,44 @@
+# packages/detection_service/cli.py
+import argparse, os
+from .server import DEFAULT_ADDRESS, serve
+from .client import DetectionClient, write_rows_csv
+
+def main():
+    p = argparse.ArgumentParser(description="Warm stance detection service and its command-line client")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve", help="Load the models once and serve detection requests")
+    s.add_argument("--bind", default=DEFAULT_ADDRESS, help="host:port or unix:/path/to/socket")
+    s.add_argument("--max-batch", type=int, default=16, help="Requests analysed together")
+    s.add_argument("--max-wait-ms", type=float, default=10.0, help="How long a batch may wait to fill")
+    s.add_argument("--max-queue", type=int, default=64, help="Queued requests before new ones are rejected (503)")
+    s.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    s.add_argument("--analysis-cache", default=None, help="Optional AnalysisCache SQLite path")
+    s.add_argument("--verbose", action="store_true", help="Log every request")
+    d = sub.add_parser("detect", help="Send text files to a running service")
+    d.add_argument("files", nargs="+")
+    d.add_argument("--service", default=os.environ.get("STANCE_SERVICE", DEFAULT_ADDRESS))
+    d.add_argument("--out", dest="out_dir", default="output", help="Where <name>_stance.csv files are written")
+    d.add_argument("--timeout", type=float, default=120.0)
+    d.add_argument("--strip-boilerplate", action="store_true", help="Remove running headers/footers before detection")
+    args = p.parse_args()
+
+    if args.cmd == "serve":
+        cache = None
+        if args.analysis_cache:
+            from packages.nltk_stance import AnalysisCache
+            cache = AnalysisCache(args.analysis_cache)
+        serve(args.bind, verbose=args.verbose, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000,
+              max_queue=args.max_queue, timeout=args.timeout, analysis_cache=cache)
+        return
+
+    client = DetectionClient(args.service, timeout=args.timeout)
+    for path in args.files:
+        with open(path, "r", encoding="utf-8") as f:
+            rows = client.detect_rows(f.read(), thesis_path=path, strip_boilerplate=args.strip_boilerplate)
+        name = os.path.splitext(os.path.basename(path))[0]
+        out = os.path.join(args.out_dir, f"{name}_stance.csv")
+        write_rows_csv(rows, out)
+        print(f"{name}: {len(rows)} markers -> {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# packages/detection_service/client.py
+import csv, json, os, socket, time
+from http.client import HTTPConnection
+
+from .server import DEFAULT_ADDRESS
+
+ROW_FIELDS = ["sentence", "stance_type", "cue", "start", "end", "section", "page"]
+
+class ServiceError(RuntimeError):
+    def __init__(self, status, message):
+        super().__init__(f"detection service returned {status}: {message}")
+        self.status = status
+
+class _UnixHTTPConnection(HTTPConnection):
+    def __init__(self, path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+class DetectionClient:
+    """
+    Client for a running detection service. Needs only the standard library, so scripts and
+    the GUI can detect without importing NLTK. A 503 (queue full) is retried with backoff.
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = 120.0, retries: int = 3):
+        self.address = address
+        self.timeout = timeout
+        self.retries = retries
+
+    def _connect(self):
+        if self.address.startswith("unix:"):
+            return _UnixHTTPConnection(self.address[len("unix:"):], timeout=self.timeout)
+        host, _, port = self.address.rpartition(":")
+        return HTTPConnection(host or "127.0.0.1", int(port), timeout=self.timeout)
+
+    def _request(self, method, path, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        for attempt in range(self.retries + 1):
+            conn = self._connect()
+            try:
+                conn.request(method, path, body=data, headers={"Content-Type": "application/json"})
+                resp = conn.getresponse()
+                payload = json.loads(resp.read() or b"{}")
+            finally:
+                conn.close()
+            if resp.status == 503 and attempt < self.retries:
+                time.sleep(float(resp.getheader("Retry-After") or 1) * (attempt + 1))
+                continue
+            if resp.status != 200:
+                raise ServiceError(resp.status, payload.get("error", ""))
+            return payload
+
+    def health(self) -> dict:
+        return self._request("GET", "/health")
+
+    def available(self) -> bool:
+        try:
+            self.health()
+            return True
+        except (OSError, ServiceError, ValueError):
+            return False
+
+    def detect_rows(self, text: str, section: str = None, page: int = None, thesis_path: str = None,
+                    attribute: bool = True, strip_boilerplate: bool = False):
+        """
+        One (sentence, stance_type, cue, start, end, section, page) list per marker. With
+        attribute, page/section come from the text's page banners and, when thesis_path is given,
+        its TOC, parsed here and sent with the text. strip_boilerplate removes running
+        headers/footers before detection.
+        """
+        body = {"text": text, "section": section, "page": page, "attribute": attribute,
+                "strip_boilerplate": strip_boilerplate}
+        if attribute and thesis_path:
+            from packages.extractor import ThesisExtractor
+            extractor = ThesisExtractor(thesis_path)
+            body["toc"] = [list(t) for t in extractor.build_map()]
+            body["page_map"] = sorted(extractor.page_map.items())
+        return self._request("POST", "/detect", body)["rows"]
+
+    def detect(self, text: str, **kwargs):
+        """Same as detect_rows(), regrouped into detect_stance_markers() dicts."""
+        return group_rows(self.detect_rows(text, **kwargs))
+
+def group_rows(rows):
+    """Marker rows back into detect_stance_markers() dicts (consecutive rows of one sentence merge)."""
+    results = []
+    for sent, stype, cue, start, end, section, page in rows:
+        last = results[-1] if results else None
+        if not last or (last["sentence"], last["section"], last["page"]) != (sent, section, page):
+            last = {"sentence": sent, "markers": [], "section": section, "page": page}
+            results.append(last)
+        last["markers"].append({"stance_type": stype, "cue": cue, "start": start, "end": end})
+    return results
+
+def write_rows_csv(rows, filename: str):
+    """Write detect_rows() output in the stance CSV schema."""
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(ROW_FIELDS)
+        writer.writerows(rows)
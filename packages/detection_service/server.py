@@ -0,0 +1,257 @@
+# packages/detection_service/server.py
+import json, os, queue, stat, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from threading import Event, Lock, Thread
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+MAX_BODY_BYTES = 20 * 1024 * 1024
+
+class Overloaded(Exception):
+    pass
+
+class _Request:
+    __slots__ = ("payload", "done", "result", "error", "cancelled", "queued_at")
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.done = Event()
+        self.result = self.error = None
+        self.cancelled = False
+        self.queued_at = time.monotonic()
+
+class DetectionService:
+    """
+    Keeps the NLTK models loaded and runs detection requests in micro-batches. Requests wait
+    in a bounded queue (a full queue is rejected at once: backpressure); one worker thread
+    takes up to `max_batch` of them, waiting at most `max_wait` seconds for the batch to fill,
+    and analyses the sentences of the whole batch together (one tag_sents() call, repeated
+    sentences analysed once). Requests whose caller has already timed out are skipped.
+    """
+
+    def __init__(self, max_batch: int = 16, max_wait: float = 0.01, max_queue: int = 64,
+                 timeout: float = 60.0, analysis_cache=None):
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self.analysis_cache = analysis_cache
+        self._queue = queue.Queue(maxsize=max(1, max_queue))
+        self._stopped = Event()
+        self.stats = {"requests": 0, "batches": 0, "rejected": 0, "timeouts": 0}
+        self._stats_lock = Lock()
+
+    def start(self, warm: bool = True):
+        if warm:
+            from packages.nltk_stance import warm_up
+            warm_up()
+        Thread(target=self._loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _count(self, name: str, n: int = 1):
+        # Handler threads and the worker both update the counters
+        with self._stats_lock:
+            self.stats[name] += n
+
+    def counters(self) -> dict:
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def detect(self, payload: dict, timeout: float = None):
+        """Queue one request and wait for it; raises Overloaded or TimeoutError."""
+        req = _Request(payload)
+        try:
+            self._queue.put_nowait(req)
+        except queue.Full:
+            self._count("rejected")
+            raise Overloaded(f"{self._queue.maxsize} requests already queued")
+        if not req.done.wait(self.timeout if timeout is None else timeout):
+            req.cancelled = True
+            self._count("timeouts")
+            raise TimeoutError("detection did not finish in time")
+        if req.error is not None:
+            raise req.error
+        return req.result
+
+    # ---------- Worker ----------
+    def _loop(self):
+        while not self._stopped.is_set():
+            try:
+                batch = [self._queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            batch = [r for r in batch if not r.cancelled]
+            if batch:
+                self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        from packages.nltk_stance import StanceDetector, PageIndex
+        self._count("batches")
+        self._count("requests", len(batch))
+        detectors = []
+        for req in batch:
+            p = req.payload
+            try:
+                det = StanceDetector(p["text"], section_name=p.get("section"), page=p.get("page"),
+                                     strip_boilerplate=p.get("strip_boilerplate", False),
+                                     analysis_cache=self.analysis_cache)
+            except Exception as e:
+                req.error = e
+                req.done.set()
+                continue
+            detectors.append((req, det))
+        if not detectors:
+            return
+
+        try:
+            wanted = {s for _, det in detectors for s in det.sentences if not det._exclude_sentence(s)}
+            analyses = self.analysis_cache.get_many(wanted) if self.analysis_cache else {}
+            fresh = detectors[0][1].analyze_many(s for s in wanted if s not in analyses)
+            if self.analysis_cache and fresh:
+                self.analysis_cache.put_many(fresh)
+            analyses.update(fresh)
+        except Exception as e:
+            for req, _ in detectors:
+                req.error = e
+                req.done.set()
+            return
+
+        for req, det in detectors:
+            try:
+                results = det.detect_compact(analyses=analyses)
+                if req.payload.get("attribute"):
+                    toc, page_map = req.payload.get("toc"), dict(req.payload.get("page_map") or [])
+                    results.attribute(PageIndex(det.clean_text, toc, page_map))
+                req.result = {"sentences": len(det.sentences), "rows": list(results.rows())}
+            except Exception as e:
+                req.error = e
+            req.done.set()
+
+# ---------- HTTP front end ----------
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service: DetectionService = None
+    verbose = False
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, fmt, *args):
+        if self.verbose:
+            super().log_message(fmt, *args)
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send(404, {"error": "not found"})
+        self._send(200, {"status": "ok", "queued": self.service.pending(), **self.service.counters()})
+
+    def do_POST(self):
+        if self.path != "/detect":
+            return self._send(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError("bad Content-Length")
+        except ValueError as e:
+            self.close_connection = True
+            return self._send(400, {"error": str(e)})
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            return self._send(413, {"error": f"body larger than {MAX_BODY_BYTES} bytes"})
+        try:
+            payload = _parse_payload(self.rfile.read(length))
+            # A client may ask for a shorter timeout than the service default, never a longer one
+            timeout = min(float(payload.get("timeout") or self.service.timeout), self.service.timeout)
+        except (ValueError, TypeError, AttributeError) as e:
+            return self._send(400, {"error": str(e)})
+        try:
+            result = self.service.detect(payload, timeout)
+        except Overloaded as e:
+            return self._send(503, {"error": str(e)}, {"Retry-After": "1"})
+        except TimeoutError as e:
+            return self._send(504, {"error": str(e)})
+        except Exception as e:
+            return self._send(500, {"error": f"{type(e).__name__}: {e}"})
+        self._send(200, result)
+
+def _parse_payload(body: bytes) -> dict:
+    """Decode and check a /detect body; raises ValueError/TypeError on anything malformed."""
+    payload = json.loads(body or b"{}")
+    if not isinstance(payload, dict):
+        raise ValueError("body must be a JSON object")
+    if not isinstance(payload.get("text"), str):
+        raise ValueError("'text' (string) is required")
+    # Sections come as the client's parsed TOC; the service never opens paths it is sent
+    payload["toc"] = [(str(title), int(printed), int(pdf)) for title, printed, pdf in payload.get("toc") or []]
+    payload["page_map"] = [(int(printed), int(pdf)) for printed, pdf in payload.get("page_map") or []]
+    if payload.get("section") is not None and not isinstance(payload["section"], str):
+        raise ValueError("'section' must be a string")
+    if payload.get("page") is not None:
+        payload["page"] = int(payload["page"])
+    if not isinstance(payload.setdefault("strip_boilerplate", False), bool):
+        raise ValueError("'strip_boilerplate' must be true or false")
+    return payload
+
+class _UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+def _remove_socket(path: str):
+    """Remove a stale unix socket at path; anything else there raises FileExistsError."""
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    os.unlink(path)
+
+def make_server(service: DetectionService, address: str = DEFAULT_ADDRESS, verbose: bool = False):
+    """HTTP server for `service` on 'host:port' or 'unix:/path/to/socket'."""
+    handler = type("DetectionHandler", (_Handler,), {"service": service, "verbose": verbose})
+    if address.startswith("unix:"):
+        path = address[len("unix:"):]
+        _remove_socket(path)
+        return _UnixHTTPServer(path, handler)
+    host, _, port = address.rpartition(":")
+    server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), handler)
+    server.daemon_threads = True
+    return server
+
+def serve(address: str = DEFAULT_ADDRESS, verbose: bool = False, **options):
+    """Run the service until interrupted; options are DetectionService arguments."""
+    service = DetectionService(**options).start()
+    server = make_server(service, address, verbose)
+    print(f"Stance detection service listening on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+        if address.startswith("unix:"):
+            _remove_socket(address[len("unix:"):])
@@ -48,6 +48,9 @@ class ThesisExtractor:
         return pairs
 
     def _map_pages(self):
+        # A bare number printed on many pages is a running header (e.g. a chapter number),
+        # not a page number, so it must not claim a printed -> pdf mapping
+        found = []  # (printed, pdf_page) in reading order
         current_pdf_page = None
         for line in self.lines:
             m_pdf = re.search(r"---\s*page\s*(\d+)\s*---", line.lower())
@@ -56,8 +59,13 @@ class ThesisExtractor:
                 continue
             m_print = re.match(r"^\s*(\d{1,3})\s*$", line.strip())
             if m_print and current_pdf_page is not None:
-                printed_num = int(m_print.group(1))
-                self.page_map.setdefault(printed_num, current_pdf_page)
+                found.append((int(m_print.group(1)), current_pdf_page))
+        pages_with = {}
+        for printed_num, pdf_page in found:
+            pages_with.setdefault(printed_num, set()).add(pdf_page)
+        for printed_num, pdf_page in found:
+            if len(pages_with[printed_num]) < 3:
+                self.page_map.setdefault(printed_num, pdf_page)
 
     def _align_toc(self, toc_pairs):
         self.Mapped_TOC = []
@@ -76,14 +84,22 @@ class ThesisExtractor:
     def _clean_title(self, title: str) -> str:
         return re.sub(r"[^A-Za-z0-9_\- ]+", "", title).strip().replace(" ", "_")
 
-    def extract_sections(self):
+    def build_map(self):
         """
-        Returns: list of tuples (title, printed_page, pdf_page, file_path)
+        Parses the TOC and page numbers without writing anything.
+        Returns: list of tuples (title, printed_page, pdf_page), sorted by pdf_page
         """
         toc = self._extract_toc()
         self._map_pages()
         self._align_toc(toc)
         self._get_page_markers()
+        return self.Mapped_TOC
+
+    def extract_sections(self):
+        """
+        Returns: list of tuples (title, printed_page, pdf_page, file_path)
+        """
+        self.build_map()
 
         os.makedirs(self.out_dir, exist_ok=True)
 
@@ -1,6 +1,7 @@
 # packages/gemini_validator/cli.py
 import argparse
 from .validator import validate_file
+from .config import MIN_CONFIDENCE, FAST_MODEL, SAMPLE_MARGIN, SAMPLE_CONFIDENCE
 
 def main():
     p = argparse.ArgumentParser(description="Validate Hyland stance CSV with Gemini")
@@ -9,10 +10,24 @@ def main():
     p.add_argument("--audit", dest="audit_csv", required=True)
     p.add_argument("--model", dest="model_name", default=None, help="Override model name")
     p.add_argument("--cache", dest="cache_path", default=None, help="Override cache path")
+    p.add_argument("--escalate-model", dest="escalate_model", default=None,
+                   help="Tiered mode: re-check flagged/changed/low-confidence rows with this model")
+    p.add_argument("--min-confidence", dest="min_confidence", type=float, default=MIN_CONFIDENCE,
+                   help="Tiered mode: escalate rows below this confidence")
+    p.add_argument("--mode", choices=["full", "sample"], default="full",
+                   help="sample: validate a stratified sample and estimate per-type precision")
+    p.add_argument("--margin", type=float, default=SAMPLE_MARGIN, help="Sample mode: target margin of error per stance type")
+    p.add_argument("--confidence", type=float, default=SAMPLE_CONFIDENCE, help="Sample mode: confidence level")
+    p.add_argument("--report", dest="report_csv", default=None, help="Sample mode: estimate CSV path")
     args = p.parse_args()
+    default_model = FAST_MODEL if args.escalate_model else "gemini-1.5-pro"
     validate_file(args.input_csv, args.output_csv, args.audit_csv,
-                  model_name=args.model_name or "gemini-1.5-pro",
-                  cache_path=args.cache_path or ".gemini_hyland_cache.jsonl")
+                  model_name=args.model_name or default_model,
+                  cache_path=args.cache_path or ".gemini_hyland_cache.jsonl",
+                  escalate_model=args.escalate_model,
+                  min_confidence=args.min_confidence,
+                  mode=args.mode, margin=args.margin, confidence_level=args.confidence,
+                  report_csv=args.report_csv)
 
 if __name__ == "__main__":
     main()
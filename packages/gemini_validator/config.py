@@ -5,3 +5,13 @@ REQUIRED_COLS = ["sentence","stance_type","cue","start","end"]
 DEFAULT_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-pro")
 ENV_API_KEY = "GEMINI_API_KEY"
 CACHE_PATH = ".gemini_hyland_cache.jsonl"
+
+# Tiered validation: every row goes to FAST_MODEL first; rows whose decision is in
+# ESCALATE_DECISIONS or whose confidence is below MIN_CONFIDENCE go to the strong model.
+FAST_MODEL = os.getenv("GEMINI_FAST_MODEL", "gemini-1.5-flash")
+ESCALATE_DECISIONS = {"flag","change"}
+MIN_CONFIDENCE = 0.7
+
+# Sampling mode: target margin of error and confidence level for per-type precision.
+SAMPLE_MARGIN = 0.05
+SAMPLE_CONFIDENCE = 0.95
@@ -24,6 +24,7 @@ Return strict JSON:
 - reasons: brief
 - corrected_cue: string (echo cue or corrected surface form)
 - offsets_ok: true/false
+- confidence: number between 0 and 1 (how sure you are of the decision)
 
 Rules:
 - self_mention: first-person forms (I, we, my, our) or inclusive we.
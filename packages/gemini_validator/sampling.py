@@ -0,0 +1,101 @@
+# packages/gemini_validator/sampling.py
+import math
+from statistics import NormalDist
+import pandas as pd
+
+STRATA_COLS = ["stance_type", "cue", "section"]
+
+def _z(confidence: float) -> float:
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+def sample_size(population: int, margin: float, confidence: float = 0.95, p: float = 0.5) -> int:
+    """Cochran's sample size with finite population correction."""
+    if population <= 0:
+        return 0
+    n0 = _z(confidence) ** 2 * p * (1 - p) / margin ** 2
+    return min(population, math.ceil(n0 / (1 + (n0 - 1) / population)))
+
+def _strata_keys(df: pd.DataFrame) -> pd.DataFrame:
+    keys = pd.DataFrame(index=df.index)
+    for c in STRATA_COLS:
+        keys[c] = df[c].fillna("").astype(str) if c in df.columns else ""
+    return keys
+
+def _allocate(sizes: list, n: int) -> list:
+    """Split n rows over strata of the given sizes: one each, the rest proportionally (largest remainder)."""
+    extra, spare = n - len(sizes), [s - 1 for s in sizes]
+    total = sum(spare)
+    if extra <= 0 or total == 0:
+        return [1] * len(sizes)
+    shares = [extra * s / total for s in spare]
+    alloc = [1 + math.floor(x) for x in shares]
+    by_remainder = sorted(range(len(sizes)), key=lambda i: math.floor(shares[i]) - shares[i])
+    for i in by_remainder[:n - sum(alloc)]:
+        alloc[i] += 1
+    return alloc
+
+def stratified_sample(df: pd.DataFrame, margin: float = 0.05, confidence: float = 0.95, seed: int = 13) -> pd.DataFrame:
+    """
+    Draw a sample stratified by stance_type, cue and section. Each stance type gets its own
+    sample_size() so every per-type interval targets `margin`; within a type the rows are
+    allocated to strata proportionally, with at least one row per stratum so rare cues are
+    never left unseen. A type never gets more than its sample_size(): when it has more strata
+    than that, its smallest strata are pooled into one '<type>|*' stratum. The returned frame
+    keeps the original index and adds a 'stratum' column.
+    """
+    keys = _strata_keys(df)
+    strata = keys.apply(lambda r: "|".join(r), axis=1)
+    picks = []
+    for stype, type_idx in keys.groupby("stance_type").groups.items():
+        n_type = sample_size(len(type_idx), margin, confidence)
+        type_strata = strata.loc[type_idx]
+        groups = sorted(type_strata.groupby(type_strata).groups.items(), key=lambda g: (-len(g[1]), g[0]))
+        if len(groups) > n_type:
+            pooled = [i for _name, idx in groups[n_type - 1:] for i in idx]
+            groups = groups[:n_type - 1] + [(f"{stype}|*", pd.Index(pooled))]
+        for (name, idx), n_h in zip(groups, _allocate([len(idx) for _name, idx in groups], n_type)):
+            picks.append(df.loc[idx].sample(n=n_h, random_state=seed).assign(stratum=name))
+    if not picks:
+        return df.iloc[0:0].assign(stratum=pd.Series(dtype=str))
+    return pd.concat(picks).sort_index()
+
+def estimate_precision(df: pd.DataFrame, sampled: pd.DataFrame, confidence: float = 0.95) -> pd.DataFrame:
+    """
+    Estimate per-stance-type precision from validated sample rows.
+
+    `sampled` needs 'stratum', 'stance_type' and a boolean 'correct' column (the model kept the
+    prior type). Strata are weighted by their population share within the type; a pooled
+    '<type>|*' stratum holds whatever the type's named strata do not. Most strata hold
+    one sampled row, so each stratum's variance uses the Agresti-Coull adjusted proportion,
+    p~(1 - p~) / n_h with p~ = (x + z^2/2) / (n_h + z^2), which stays positive for n_h = 1 and for
+    all-correct strata; only fully enumerated strata (n_h = N_h) add none. The interval is
+    normal with finite population correction, clamped to [0, 1].
+    """
+    keys = _strata_keys(df)
+    pop = keys.apply(lambda r: "|".join(r), axis=1).value_counts()
+    z = _z(confidence)
+    rows = []
+    for stype, grp in sampled.groupby("stance_type"):
+        N_t = int((df["stance_type"] == stype).sum())
+        p_hat, var = 0.0, 0.0
+        named = sum(int(pop[s]) for s in grp["stratum"].unique() if s in pop)
+        for stratum, g in grp.groupby("stratum"):
+            N_h, n_h = int(pop[stratum]) if stratum in pop else N_t - named, len(g)
+            w = N_h / N_t
+            x_h = float(g["correct"].sum())
+            p_hat += w * x_h / n_h
+            p_adj = (x_h + z ** 2 / 2) / (n_h + z ** 2)
+            var += w ** 2 * (1 - n_h / N_h) * p_adj * (1 - p_adj) / n_h
+        half = z * math.sqrt(var)
+        unvalidated = N_t - len(grp)
+        rows.append({
+            "stance_type": stype,
+            "population": N_t,
+            "sampled": len(grp),
+            "precision": round(p_hat, 4),
+            "ci_low": round(max(0.0, p_hat - half), 4),
+            "ci_high": round(min(1.0, p_hat + half), 4),
+            "projected_corrections": round((1 - p_hat) * unvalidated, 1),
+        })
+    return pd.DataFrame(rows, columns=["stance_type", "population", "sampled", "precision",
+                                       "ci_low", "ci_high", "projected_corrections"])
@@ -5,9 +5,11 @@ from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import google.generativeai as genai
 
-from .config import REQUIRED_COLS, ALLOWED_STANCE, DEFAULT_MODEL, ENV_API_KEY, CACHE_PATH
+from .config import (REQUIRED_COLS, ALLOWED_STANCE, DEFAULT_MODEL, ENV_API_KEY, CACHE_PATH,
+                     ESCALATE_DECISIONS, MIN_CONFIDENCE, SAMPLE_MARGIN, SAMPLE_CONFIDENCE)
 from .prompt import build_prompt, normalize_stance
 from .cache import JsonlCache
+from .sampling import stratified_sample, estimate_precision
 
 def _hash_row(row, version="v1"):
     payload = json.dumps({
@@ -38,15 +40,57 @@ def _gemini_call(model, prompt):
     out["reasons"] = str(out.get("reasons",""))
     out["corrected_cue"] = str(out.get("corrected_cue",""))
     out["offsets_ok"] = bool(out.get("offsets_ok", False))
+    try:
+        out["confidence"] = min(1.0, max(0.0, float(out.get("confidence", 0.0))))
+    except (TypeError, ValueError):
+        out["confidence"] = 0.0
     return out
 
-def validate_file(input_csv: str, output_csv: str, audit_csv: str, model_name: str = DEFAULT_MODEL, cache_path: str = CACHE_PATH):
+def _validate_row(model, row_d, cache, key):
+    res = cache.get(key)
+    if res is None:
+        prompt = build_prompt(row_d)
+        try:
+            res = _gemini_call(model, prompt)
+        except Exception as e:
+            res = {"validated_stance_type":"hedging","decision":"flag","reasons":f"error:{type(e).__name__}",
+                   "corrected_cue":row_d.get("cue",""),"offsets_ok":False,"confidence":0.0}
+        cache.set(key, res)
+    return res
+
+def _needs_escalation(res, min_confidence=MIN_CONFIDENCE):
+    # Cached results written before confidence was requested count as unsure.
+    return res.get("decision") in ESCALATE_DECISIONS or float(res.get("confidence") or 0.0) < min_confidence
+
+def validate_file(input_csv: str, output_csv: str, audit_csv: str, model_name: str = DEFAULT_MODEL, cache_path: str = CACHE_PATH,
+                  escalate_model: str = None, min_confidence: float = MIN_CONFIDENCE,
+                  mode: str = "full", margin: float = SAMPLE_MARGIN, confidence_level: float = SAMPLE_CONFIDENCE,
+                  report_csv: str = None, progress=None):
+    """
+    Validate the rows of a stance CSV with Gemini (all rows by default).
+
+    With escalate_model set, the run is tiered: model_name (normally a flash model) sees every
+    row and only rows it flags, changes, or answers with confidence below min_confidence are
+    sent to escalate_model. Each tier is cached under its own key and recorded in the audit CSV.
+
+    With mode="sample", only a stratified sample (stance_type x cue x section) sized for the
+    target margin of error of each stance type is validated. output_csv/audit_csv then hold the sampled rows and
+    report_csv (default: <output>_estimate.csv) holds per-type precision with confidence
+    intervals and projected corrections for the unvalidated rows; the report is also returned.
+
+    progress, if given, is called as progress(rows_done, row_count) after each row. The cache is
+    flushed even if it raises, so a cancelled run keeps the answers it already paid for.
+    """
+    if mode not in {"full", "sample"}:
+        raise ValueError(f"Unknown mode: {mode}")
     load_dotenv()
     api_key = os.getenv(ENV_API_KEY)
     if not api_key:
         raise RuntimeError(f"{ENV_API_KEY} is not set")
     genai.configure(api_key=api_key)
     model = genai.GenerativeModel(model_name)
+    tiered = bool(escalate_model) and escalate_model != model_name
+    strong = genai.GenerativeModel(escalate_model) if tiered else None
 
     df = pd.read_csv(input_csv)
     missing = [c for c in REQUIRED_COLS if c not in df.columns]
@@ -54,43 +98,69 @@ def validate_file(input_csv: str, output_csv: str, audit_csv: str, model_name: s
         raise ValueError(f"Missing required columns: {missing}")
 
     df["stance_type"] = df["stance_type"].map(normalize_stance)
+    rows = stratified_sample(df, margin, confidence_level) if mode == "sample" else df
 
     cache = JsonlCache(cache_path)
-    audits, out_rows = [], []
-
-    for idx, row in df.iterrows():
-        row_d = row.to_dict()
-        key = _hash_row(row_d)
-        res = cache.get(key)
-        if res is None:
-            prompt = build_prompt(row_d)
-            try:
-                res = _gemini_call(model, prompt)
-            except Exception as e:
-                res = {"validated_stance_type":"hedging","decision":"flag","reasons":f"error:{type(e).__name__}",
-                       "corrected_cue":row_d.get("cue",""),"offsets_ok":False}
-            cache.set(key, res)
-
-        new_row = row.copy()
-        new_row["validated_stance_type"] = res["validated_stance_type"]
-        new_row["decision"] = res["decision"]
-        if res["decision"] in {"change","keep"} and res.get("corrected_cue"):
-            new_row["cue"] = res["corrected_cue"]
-        out_rows.append(new_row)
-
-        audits.append({
-            "row_index": idx,
-            "stance_type_prior": row_d.get("stance_type"),
-            "cue_prior": row_d.get("cue"),
-            "start": row_d.get("start"),
-            "end": row_d.get("end"),
-            "validated_stance_type": res.get("validated_stance_type"),
-            "corrected_cue": res.get("corrected_cue"),
-            "offsets_ok": res.get("offsets_ok"),
-            "decision": res.get("decision"),
-            "reasons": res.get("reasons")
-        })
+    audits, out_rows, correct = [], [], []
+
+    try:
+        for idx, row in rows.iterrows():
+            row_d = row.to_dict()
+            # Verdicts are cached per model, so one model never reuses (or overwrites) another's
+            first = _validate_row(model, row_d, cache, _hash_row(row_d, version=f"v1_{model_name}"))
+            if tiered:
+                escalated = _needs_escalation(first, min_confidence)
+                second = _validate_row(strong, row_d, cache, _hash_row(row_d, version=f"v1_{escalate_model}")) if escalated else None
+                res = second or first
+            else:
+                res = first
+
+            new_row = row.copy()
+            new_row["validated_stance_type"] = res["validated_stance_type"]
+            new_row["decision"] = res["decision"]
+            if res["decision"] in {"change","keep"} and res.get("corrected_cue"):
+                new_row["cue"] = res["corrected_cue"]
+            out_rows.append(new_row)
+            correct.append(res["decision"] == "keep" and res["validated_stance_type"] == row_d.get("stance_type"))
+
+            audit = {
+                "row_index": idx,
+                "stance_type_prior": row_d.get("stance_type"),
+                "cue_prior": row_d.get("cue"),
+                "start": row_d.get("start"),
+                "end": row_d.get("end"),
+                "validated_stance_type": res.get("validated_stance_type"),
+                "corrected_cue": res.get("corrected_cue"),
+                "offsets_ok": res.get("offsets_ok"),
+                "decision": res.get("decision"),
+                "reasons": res.get("reasons"),
+                "confidence": res.get("confidence")
+            }
+            if tiered:
+                audit.update({
+                    "fast_model": model_name,
+                    "fast_validated_stance_type": first.get("validated_stance_type"),
+                    "fast_decision": first.get("decision"),
+                    "fast_confidence": first.get("confidence"),
+                    "escalated": escalated,
+                    "escalate_model": escalate_model if escalated else "",
+                    "escalate_validated_stance_type": second.get("validated_stance_type") if second else "",
+                    "escalate_decision": second.get("decision") if second else "",
+                    "escalate_confidence": second.get("confidence") if second else ""
+                })
+            audits.append(audit)
+            if progress:
+                progress(len(out_rows), len(rows))
+    finally:
+        cache.flush()
 
     pd.DataFrame(out_rows).to_csv(output_csv, index=False)
     pd.DataFrame(audits).to_csv(audit_csv, index=False)
-    cache.flush()
+
+    if mode == "sample":
+        report = estimate_precision(df, rows.assign(correct=correct), confidence_level)
+        if report_csv is None:
+            base, ext = os.path.splitext(output_csv)
+            report_csv = f"{base}_estimate{ext}"
+        report.to_csv(report_csv, index=False)
+        return report
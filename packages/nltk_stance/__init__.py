@@ -1,4 +1,7 @@
 # nltk_stance/__init__.py
-from .preprocessor import TextPreprocessor
+from .preprocessor import TextPreprocessor, warm_up
 from .stance_lexicon import STANCE_LEXICON
-from .stance_detector import StanceDetector
+from .stance_detector import StanceDetector, write_results_csv
+from .results import DetectionResults
+from .attribution import PageIndex
+from .analysis_cache import AnalysisCache
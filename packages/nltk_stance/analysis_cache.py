@@ -0,0 +1,119 @@
+# nltk_stance/analysis_cache.py
+import os, sqlite3, zlib, hashlib
+from array import array
+from threading import Lock
+
+ANALYSIS_CACHE_PATH = ".stance_analysis_cache.sqlite"
+FORMAT_VERSION = "1"
+_SEP_FIELD, _SEP_ITEM = "\x1e", "\x1f"
+
+def model_version() -> str:
+    """
+    Fingerprint of everything the cached analyses depend on: NLTK itself, the tagger model
+    and the WordNet data. Lexicon and matching rules are deliberately not part of it.
+    """
+    import nltk
+    from packages.nltk_stance.preprocessor import get_tagger, get_lemmatizer
+    tagger = get_tagger()
+    parts = [FORMAT_VERSION, nltk.__version__, f"tagger:{len(tagger.model.weights)}:{len(tagger.tagdict)}"]
+    try:
+        get_lemmatizer()  # WordNet loaded under the preprocessor's load lock
+        from nltk.corpus import wordnet
+        parts.append(f"wordnet:{wordnet.get_version()}")
+    except Exception:
+        parts.append("wordnet:?")
+    return "|".join(parts)
+
+def _key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+def _encode(tokens, tags, lemmas):
+    # Lemmas equal to the lower-cased token (the common case) are stored as ""
+    lem = ["" if l == t.lower() else l for t, l in zip(tokens, lemmas)]
+    fields = (_SEP_ITEM.join(tokens), _SEP_ITEM.join(tags), _SEP_ITEM.join(lem))
+    return zlib.compress(_SEP_FIELD.join(fields).encode("utf-8"))
+
+def _decode(blob):
+    tok_s, tag_s, lem_s = zlib.decompress(blob).decode("utf-8").split(_SEP_FIELD)
+    tokens = tok_s.split(_SEP_ITEM) if tok_s else []
+    tags = tag_s.split(_SEP_ITEM) if tag_s else []
+    lems = lem_s.split(_SEP_ITEM) if tokens else []
+    return tokens, tags, [l or t.lower() for t, l in zip(tokens, lems)]
+
+class AnalysisCache:
+    """
+    On-disk cache of the lexicon-independent part of detection: sentence splits per document
+    and (tokens, POS tags, lemmas) per sentence, keyed by content hash. Entries are tied to
+    model_version(); when NLTK, the tagger or WordNet change, the cache empties itself.
+    Editing LEMMA_UNIGRAMS, MULTIWORD or the negation window leaves it valid, so a rerun only
+    repeats the matching step.
+    """
+
+    def __init__(self, path: str = ANALYSIS_CACHE_PATH, version: str = None):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT);
+            CREATE TABLE IF NOT EXISTS analyses (key BLOB PRIMARY KEY, value BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS splits (key BLOB PRIMARY KEY, value BLOB NOT NULL);
+        """)
+        self.version = version or model_version()
+        row = self.conn.execute("SELECT v FROM meta WHERE k = 'version'").fetchone()
+        if row is None or row[0] != self.version:
+            with self.conn:
+                self.conn.execute("DELETE FROM analyses")
+                self.conn.execute("DELETE FROM splits")
+                self.conn.execute("INSERT OR REPLACE INTO meta(k, v) VALUES ('version', ?)", (self.version,))
+
+    def close(self):
+        self.conn.close()
+
+    # ---------- Sentence splits ----------
+    def get_sentences(self, text: str):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM splits WHERE key = ?", (_key(text),)).fetchone()
+        if row is None:
+            return None
+        spans = array("I")
+        spans.frombytes(zlib.decompress(row[0]))
+        return [text[spans[i]:spans[i + 1]] for i in range(0, len(spans), 2)]
+
+    def put_sentences(self, text: str, sentences):
+        spans, cursor = array("I"), 0
+        for sent in sentences:
+            pos = text.find(sent, cursor)
+            if pos == -1:
+                return  # not plain slices of the text; nothing safe to store
+            spans.extend((pos, pos + len(sent)))
+            cursor = pos + len(sent)
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO splits(key, value) VALUES (?, ?)",
+                              (_key(text), zlib.compress(spans.tobytes())))
+
+    # ---------- Per-sentence analyses ----------
+    def get_many(self, sentences):
+        """{sentence: (tokens, tags, lemmas)} for the sentences already cached."""
+        by_key = {_key(s): s for s in sentences}
+        keys = list(by_key)
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                sql = f"SELECT key, value FROM analyses WHERE key IN ({','.join('?' * len(chunk))})"
+                for key, value in self.conn.execute(sql, chunk):
+                    found[by_key[key]] = _decode(value)
+        return found
+
+    def put_many(self, analyses):
+        """Store {sentence: (tokens, tags, lemmas)}; tokens containing the separators are skipped."""
+        rows = []
+        for sent, (tokens, tags, lemmas) in analyses.items():
+            if any(_SEP_FIELD in t or _SEP_ITEM in t for t in tokens):
+                continue
+            rows.append((_key(sent), _encode(tokens, tags, lemmas)))
+        if rows:
+            with self._lock, self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO analyses(key, value) VALUES (?, ?)", rows)
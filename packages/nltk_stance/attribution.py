@@ -0,0 +1,54 @@
+# nltk_stance/attribution.py
+import re
+from bisect import bisect_right
+
+PAGE_BANNER = re.compile(r"-{2,}\s*page\s*(\d+)\s*-{2,}", re.IGNORECASE)
+
+class PageIndex:
+    """
+    Maps a character offset in one document text to (pdf_page, printed_page, section).
+    PDF pages come from the '--- Page N ---' banners PDFExtractor writes, found once and
+    kept as sorted offsets; sections come from ThesisExtractor's TOC map, kept as sorted
+    start pages. Both lookups are a binary search, so attributing every sentence of a
+    thesis costs one pass over the text plus O(log n) per sentence.
+    """
+
+    def __init__(self, text: str, toc=None, page_map=None):
+        self.starts, self.pages = [], []
+        for m in PAGE_BANNER.finditer(text):
+            self.starts.append(m.start())
+            self.pages.append(int(m.group(1)))
+        # ThesisExtractor.page_map is printed -> pdf; keep the lowest printed number per pdf page
+        self.printed = {}
+        for printed, pdf in sorted((page_map or {}).items()):
+            self.printed.setdefault(pdf, printed)
+        toc = sorted(toc or [], key=lambda x: x[2])
+        self.section_pages = [pdf for _title, _printed, pdf in toc]
+        self.section_titles = [title for title, _printed, _pdf in toc]
+
+    @classmethod
+    def from_thesis(cls, text: str, thesis_path: str = None):
+        """Index for `text` (the cleaned text detection ran on), with sections from the thesis file's TOC."""
+        if not thesis_path:
+            return cls(text)
+        from packages import ThesisExtractor
+        extractor = ThesisExtractor(thesis_path)
+        toc = extractor.build_map()
+        return cls(text, toc, extractor.page_map)
+
+    def __bool__(self):
+        return bool(self.starts)
+
+    def pdf_page(self, offset: int):
+        i = bisect_right(self.starts, offset) - 1
+        return self.pages[i] if i >= 0 else None
+
+    def section(self, pdf_page):
+        if pdf_page is None:
+            return None
+        j = bisect_right(self.section_pages, pdf_page) - 1
+        return self.section_titles[j] if j >= 0 else None
+
+    def locate(self, offset: int):
+        pdf = self.pdf_page(offset)
+        return pdf, self.printed.get(pdf), self.section(pdf)
@@ -0,0 +1,60 @@
+# nltk_stance/boilerplate.py
+import re, math, hashlib
+from collections import defaultdict
+
+PAGE_LINE = re.compile(r"^\s*-{2,}\s*page\s*\d+\s*-{2,}\s*$", re.IGNORECASE)
+ROMAN = re.compile(r"^[ivxlcdm]+$", re.IGNORECASE)
+
+def _line_key(line: str) -> bytes:
+    # Digits (and bare roman numerals) are masked so "Chapter 3 | 45" matches "Chapter 3 | 46"
+    norm = " ".join(line.lower().split())
+    norm = "#" if ROMAN.match(norm) else re.sub(r"\d+", "#", norm)
+    return hashlib.blake2b(norm.encode("utf-8"), digest_size=8).digest()
+
+def _pages(lines):
+    """Split line indices into pages at '--- Page N ---' banners."""
+    pages, current = [], []
+    for i, line in enumerate(lines):
+        if PAGE_LINE.match(line):
+            if current:
+                pages.append(current)
+            current = []
+        elif line.strip():
+            current.append(i)
+    if current:
+        pages.append(current)
+    return pages
+
+def find_boilerplate(lines, edge_lines: int = 3, min_fraction: float = 0.3, min_pages: int = 3):
+    """
+    Indices of running headers/footers: lines within `edge_lines` of a page's top or bottom whose
+    digit-masked hash recurs in the same zone on at least `min_fraction` of pages (and `min_pages`).
+    Needs page banners; text with fewer than `min_pages` pages is left alone.
+    """
+    pages = _pages(lines)
+    if len(pages) < min_pages:
+        return set()
+    seen = defaultdict(set)
+    candidates = []
+    for p, idxs in enumerate(pages):
+        # Short pages: keep the zones from overlapping so body lines are never both top and bottom
+        k = min(edge_lines, len(idxs) // 2)
+        zones = [("top", idxs[:k]), ("bottom", idxs[len(idxs) - k:])]
+        for zone, zone_idxs in zones:
+            for i in zone_idxs:
+                key = (zone, _line_key(lines[i]))
+                seen[key].add(p)
+                candidates.append((key, i))
+    threshold = max(min_pages, math.ceil(min_fraction * len(pages)))
+    return {i for key, i in candidates if len(seen[key]) >= threshold}
+
+def strip_boilerplate(text: str, edge_lines: int = 3, min_fraction: float = 0.3):
+    """
+    Remove running headers, footers and printed page numbers, keeping page banners so page
+    attribution still works. Returns (stripped_text, lines removed).
+    """
+    lines = text.splitlines(keepends=True)
+    drop = find_boilerplate(lines, edge_lines, min_fraction)
+    if not drop:
+        return text, 0
+    return "".join(line for i, line in enumerate(lines) if i not in drop), len(drop)
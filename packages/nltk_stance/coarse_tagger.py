@@ -0,0 +1,151 @@
+# nltk_stance/coarse_tagger.py
+import os, zlib
+from functools import lru_cache
+import numpy as np
+
+COARSE_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "coarse_tagger.npz")
+DIM = 1 << 17
+
+# The only tag distinctions StanceDetector uses: PRP* (self-mention), V*/MD/RB/JJ (hedge and
+# booster gate) and V/N/J/other (WordNet POS for lemmas). Each class is emitted as one Penn tag
+# from that class, so _match_unigrams and the lemmatizer take the same decisions as with the
+# full tag.
+COARSE_TAGS = ("X", "NN", "VB", "MD", "RB", "JJ", "JJR", "PRP")
+_TAG_INDEX = {t: i for i, t in enumerate(COARSE_TAGS)}
+_PAD_LEFT, _PAD_RIGHT = "<s>", "</s>"
+
+def coarse_tag(penn: str) -> str:
+    """Coarse class of a Penn Treebank tag."""
+    if penn.startswith("PRP"):
+        return "PRP"
+    if penn.startswith("V"):
+        return "VB"
+    if penn in ("MD", "RB", "JJ"):
+        return penn
+    if penn.startswith("J"):
+        return "JJR"
+    if penn.startswith("N"):
+        return "NN"
+    return "X"
+
+def _h(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8")) % DIM
+
+def _shape(word: str) -> str:
+    if word[:1].isupper():
+        return "Xx" if not word.isupper() else "XX"
+    if word[:1].isdigit():
+        return "d"
+    return "x" if word[:1].isalpha() else "p"
+
+@lru_cache(maxsize=100_000)
+def _word_features(word: str):
+    """
+    Hashed features of one word in every role it plays for a token: itself (bias, word,
+    suffixes, prefix, shape) and as the -2/-1/+1/+2 neighbour. Cached per word, so tagging a
+    sentence is list lookups plus one NumPy gather.
+    """
+    low = word.lower()
+    return (_h("b"), _h("w=" + low), _h("s3=" + low[-3:]), _h("s2=" + low[-2:]), _h("p1=" + low[:1]),
+            _h("sh=" + _shape(word)),
+            _h("w-1=" + low), _h("s3-1=" + low[-3:]), _h("w+1=" + low), _h("s3+1=" + low[-3:]),
+            _h("w-2=" + low), _h("w+2=" + low))
+
+_FIRST, _REST = _h("first"), _h("rest")
+
+def sentence_features(tokens) -> np.ndarray:
+    """(len(tokens), 13) array of feature rows for one tokenized sentence."""
+    rows = np.array([_word_features(w) for w in [_PAD_LEFT, _PAD_LEFT, *tokens, _PAD_RIGHT, _PAD_RIGHT]],
+                    dtype=np.int64)
+    pos = np.full((len(tokens), 1), _REST, dtype=np.int64)
+    pos[:1] = _FIRST
+    return np.concatenate([rows[2:-2, 0:6], rows[1:-3, 6:8], rows[3:-1, 8:10], rows[0:-4, 10:11],
+                           rows[4:, 11:12], pos], axis=1)
+
+def batch_features(sentences):
+    lengths = [len(s) for s in sentences]
+    feats = [sentence_features(s) for s in sentences if s]
+    return (np.concatenate(feats) if feats else np.zeros((0, 13), dtype=np.int64)), lengths
+
+class CoarseTagger:
+    """
+    Linear (softmax) tagger over hashed word and context features that predicts only
+    COARSE_TAGS. No dependency on the previous tag, so a whole batch of sentences is scored
+    with one gather-and-sum over the weight matrix. Trained from the full perceptron's own
+    output with train_coarse_tagger.py.
+    """
+
+    def __init__(self, weights: np.ndarray = None, bias: np.ndarray = None):
+        self.weights = np.zeros((DIM, len(COARSE_TAGS)), dtype=np.float32) if weights is None else weights
+        self.bias = np.zeros(len(COARSE_TAGS), dtype=np.float32) if bias is None else bias
+
+    def _scores(self, feats: np.ndarray) -> np.ndarray:
+        return self.weights[feats].sum(axis=1) + self.bias
+
+    def tag_sents(self, sentences):
+        """One list of coarse tags per tokenized sentence (same shape as the tokens)."""
+        feats, lengths = batch_features(sentences)
+        labels = self._scores(feats).argmax(axis=1) if len(feats) else []
+        out, i = [], 0
+        for n in lengths:
+            out.append([COARSE_TAGS[k] for k in labels[i:i + n]])
+            i += n
+        return out
+
+    def tag(self, tokens):
+        """(token, coarse tag) pairs, like PerceptronTagger.tag()."""
+        return list(zip(tokens, self.tag_sents([tokens])[0]))
+
+    # ---------- Training ----------
+    def fit(self, sentences, tags, epochs: int = 4, lr: float = 0.5, batch: int = 2048, seed: int = 0, log=None):
+        """Minibatch SGD on softmax loss. tags may be Penn or coarse tags; they are mapped to COARSE_TAGS."""
+        feats, _ = batch_features(sentences)
+        y = np.array([_TAG_INDEX[coarse_tag(t)] for sent in tags for t in sent], dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        for epoch in range(epochs):
+            order = rng.permutation(len(y))
+            rate = lr / (1 + epoch)
+            for start in range(0, len(order), batch):
+                idx = order[start:start + batch]
+                f = feats[idx]
+                scores = self._scores(f)
+                scores -= scores.max(axis=1, keepdims=True)
+                grad = np.exp(scores)
+                grad /= grad.sum(axis=1, keepdims=True)
+                grad[np.arange(len(idx)), y[idx]] -= 1.0
+                grad *= rate / len(idx)
+                np.add.at(self.weights, f, -grad[:, None, :])
+                self.bias -= grad.sum(axis=0)
+            if log:
+                log(f"epoch {epoch + 1}/{epochs}: agreement {self.agreement(sentences, tags)['all']:.4f}")
+        return self
+
+    def agreement(self, sentences, tags):
+        """Share of tokens whose coarse class matches the reference tags, overall ('all') and per class."""
+        predicted = [t for sent in self.tag_sents(sentences) for t in sent]
+        gold = [coarse_tag(t) for sent in tags for t in sent]
+        out = {"all": float(np.mean([p == g for p, g in zip(predicted, gold)])) if gold else 1.0}
+        for cls in COARSE_TAGS:
+            hits = [p == g for p, g in zip(predicted, gold) if g == cls]
+            if hits:
+                out[cls] = float(np.mean(hits))
+        return out
+
+    # ---------- Persistence ----------
+    def save(self, path: str = COARSE_MODEL_PATH):
+        np.savez_compressed(path, weights=self.weights.astype(np.float16), bias=self.bias,
+                            tags=np.array(COARSE_TAGS), dim=DIM)
+
+    @classmethod
+    def load(cls, path: str = COARSE_MODEL_PATH) -> "CoarseTagger":
+        with np.load(path) as data:
+            if tuple(data["tags"]) != COARSE_TAGS or int(data["dim"]) != DIM:
+                raise ValueError(f"{path} was trained for a different feature layout; retrain it")
+            return cls(data["weights"].astype(np.float32), data["bias"].astype(np.float32))
+
+@lru_cache(maxsize=None)
+def get_coarse_tagger(path: str = COARSE_MODEL_PATH) -> CoarseTagger:
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No coarse tagger model at {path}; "
+                                "train one with python -m packages.nltk_stance.train_coarse_tagger")
+    return CoarseTagger.load(path)
@@ -0,0 +1,172 @@
+# nltk_stance/evaluate.py
+import argparse, csv, os, sys, time, tracemalloc
+from collections import Counter
+
+from packages.nltk_stance.stance_detector import StanceDetector
+from packages.nltk_stance.coarse_tagger import COARSE_MODEL_PATH
+
+# Detector modes under test: name -> callable(text) returning detect_stance_markers()-shaped
+# results. "reference" is the original per-sentence loop, the baseline every other mode is
+# compared against.
+MODES = {
+    "reference": lambda text: StanceDetector(text).detect_stance_markers_reference(),
+    "compact": lambda text: StanceDetector(text).detect_compact(),
+}
+# Modes whose work runs in worker processes: tracemalloc only sees the main process
+POOL_MODES = set()
+
+def register_mode(name, fn, pool: bool = False):
+    MODES[name] = fn
+    if pool:
+        POOL_MODES.add(name)
+
+_memory_cache = []
+
+def _cached(text):
+    # One in-memory AnalysisCache for the whole run: the timed pass measures a warm rerun
+    if not _memory_cache:
+        from packages.nltk_stance.analysis_cache import AnalysisCache
+        _memory_cache.append(AnalysisCache(":memory:"))
+    return StanceDetector(text, analysis_cache=_memory_cache[0]).detect_compact()
+
+register_mode("cached", _cached)
+# Small chunks so even short gold texts are split and the seam merging is actually compared
+register_mode("parallel", lambda text: StanceDetector(text, workers=max(2, os.cpu_count() or 2),
+                                                      chunk_chars=2_000).detect_compact(), pool=True)
+
+# Only when a model has been trained (python -m packages.nltk_stance.train_coarse_tagger)
+if os.path.exists(COARSE_MODEL_PATH):
+    register_mode("coarse", lambda text: StanceDetector(text, tagger="coarse").detect_compact())
+
+def _norm(sentence: str) -> str:
+    return " ".join(str(sentence).split())
+
+def marker_keys(results):
+    """(sentence, stance_type, cue, start, end) for every marker, whitespace-normalised."""
+    keys = set()
+    for item in results:
+        sent = _norm(item["sentence"])
+        for m in item["markers"]:
+            keys.add((sent, m["stance_type"], str(m["cue"]).lower(), int(m["start"]), int(m["end"])))
+    return keys
+
+def load_gold(path: str):
+    """Gold markers from a CSV in the sentence, stance_type, cue, start, end schema."""
+    keys, sentences = set(), []
+    seen = set()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for rec in csv.DictReader(f):
+            sent = _norm(rec["sentence"])
+            keys.add((sent, rec["stance_type"], rec["cue"].lower(), int(rec["start"]), int(rec["end"])))
+            if sent not in seen:
+                seen.add(sent)
+                sentences.append(sent)
+    return keys, sentences
+
+def score(predicted, gold):
+    """Per-stance-type precision, recall and F1 (plus 'all'), matching markers exactly."""
+    tp, fp, fn = Counter(), Counter(), Counter()
+    for k in predicted & gold:
+        tp[k[1]] += 1
+    for k in predicted - gold:
+        fp[k[1]] += 1
+    for k in gold - predicted:
+        fn[k[1]] += 1
+    out = {}
+    for stype in sorted(set(tp) | set(fp) | set(fn)) + ["all"]:
+        t = sum(tp.values()) if stype == "all" else tp[stype]
+        p_den = t + (sum(fp.values()) if stype == "all" else fp[stype])
+        r_den = t + (sum(fn.values()) if stype == "all" else fn[stype])
+        p = t / p_den if p_den else 0.0
+        r = t / r_den if r_den else 0.0
+        out[stype] = {"precision": p, "recall": r, "f1": 2 * p * r / (p + r) if p + r else 0.0}
+    return out
+
+def run_mode(fn, texts):
+    """Run one mode over all texts; returns (marker keys, sentences/sec, peak MiB of the main process)."""
+    n_sent = sum(len(StanceDetector(t).sentences) for t in texts)
+    if texts:
+        fn(texts[0])  # warm models so the first mode does not pay the load
+    start = time.perf_counter()
+    keys = set()
+    for t in texts:
+        keys |= marker_keys(fn(t))
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    for t in texts:
+        fn(t)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return keys, (n_sent / elapsed if elapsed else float("inf")), peak / (1 << 20)
+
+def evaluate(gold_csvs, modes=None, tolerance: float = 0.0):
+    """
+    Score every mode against the gold CSVs. Each gold CSV is detected over the matching .txt next
+    to it if one exists, otherwise over its own sentences joined in order. Returns (rows, failures):
+    a non-reference mode fails when the share of markers it adds or drops relative to "reference"
+    exceeds `tolerance`. Unknown mode names raise ValueError.
+    """
+    unknown = [n for n in modes or () if n not in MODES]
+    if unknown:
+        raise ValueError(f"unknown mode(s) {', '.join(unknown)}; choose from {', '.join(MODES)}")
+    gold, texts = set(), []
+    for path in gold_csvs:
+        keys, sentences = load_gold(path)
+        gold |= keys
+        txt = os.path.splitext(path)[0] + ".txt"
+        if os.path.exists(txt):
+            with open(txt, "r", encoding="utf-8") as f:
+                texts.append(f.read())
+        else:
+            texts.append(" ".join(sentences))
+
+    names = ["reference"] + [n for n in (modes or MODES) if n != "reference"]
+    rows, failures, reference = [], [], None
+    for name in names:
+        keys, speed, peak = run_mode(MODES[name], texts)
+        if name == "reference":
+            reference = keys
+        diff = len(keys ^ reference) / max(1, len(reference))
+        scores = score(keys, gold)
+        for stype, s in scores.items():
+            rows.append({"mode": name, "stance_type": stype, **s, "sent_per_s": speed, "peak_mib": peak,
+                         "peak_main_only": name in POOL_MODES, "diff_vs_reference": diff})
+        if diff > tolerance:
+            failures.append(f"{name}: {diff:.2%} of markers differ from reference (tolerance {tolerance:.2%})")
+    return rows, failures
+
+def format_table(rows):
+    header = f"{'mode':<14}{'type':<14}{'P':>7}{'R':>7}{'F1':>7}{'sent/s':>10}{'peak MiB':>10}{'diff':>8}"
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        peak = f"{r['peak_mib']:.1f}" + ("*" if r.get("peak_main_only") else "")
+        lines.append(f"{r['mode']:<14}{r['stance_type']:<14}{r['precision']:>7.3f}{r['recall']:>7.3f}{r['f1']:>7.3f}"
+                     f"{r['sent_per_s']:>10.1f}{peak:>10}{r['diff_vs_reference']:>8.2%}")
+    if any(r.get("peak_main_only") for r in rows):
+        lines.append("* main process only; memory used by worker processes is not included")
+    return "\n".join(lines)
+
+def main():
+    p = argparse.ArgumentParser(description="Compare StanceDetector modes on gold Hyland annotations")
+    p.add_argument("gold", nargs="+", help="Gold CSVs (sentence, stance_type, cue, start, end); optional <name>.txt beside each")
+    p.add_argument("--modes", nargs="*", default=None, help=f"Modes to run (default: all of {', '.join(MODES)})")
+    p.add_argument("--tolerance", type=float, default=0.0, help="Allowed share of markers differing from reference")
+    p.add_argument("--out", dest="out_csv", default=None, help="Also write the table as CSV")
+    args = p.parse_args()
+    unknown = [n for n in args.modes or () if n not in MODES]
+    if unknown:
+        p.error(f"unknown mode(s) {', '.join(unknown)}; choose from {', '.join(MODES)}")
+
+    rows, failures = evaluate(args.gold, args.modes, args.tolerance)
+    print(format_table(rows))
+    if args.out_csv:
+        with open(args.out_csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures), file=sys.stderr)
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,141 @@
 # nltk_stance/preprocessor.py
+import atexit, re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from threading import Lock
 import nltk
 from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk import pos_tag
+from nltk.tag.perceptron import PerceptronTagger
+from nltk.stem import WordNetLemmatizer
+
+from packages.nltk_stance.boilerplate import strip_boilerplate as _strip_boilerplate
+
+# NLTK's LazyCorpusLoader is not safe to trigger from two threads at once (the warm-up job
+# and a detection job can both hit it right after startup), so first loads are serialised
+_load_lock = Lock()
+
+@lru_cache(maxsize=None)
+def get_tagger():
+    # nltk.pos_tag() builds (and unpickles) a new PerceptronTagger on every call;
+    # one shared instance gives the same tags without the per-sentence load.
+    with _load_lock:
+        return PerceptronTagger()
+
+@lru_cache(maxsize=None)
+def get_lemmatizer():
+    with _load_lock:
+        wnl = WordNetLemmatizer()
+        wnl.lemmatize("warming", pos="v")  # loads WordNet now, under the lock
+    return wnl
+
+def lemmatize(token, tag):
+    # WordNet POS from the Penn tag: V -> verb, N -> noun, J -> adjective, anything else adverb
+    pos = 'v' if tag.startswith('V') else 'n' if tag.startswith('N') else 'a' if tag.startswith('J') else 'r'
+    return get_lemmatizer().lemmatize(token.lower(), pos=pos)
+
+def warm_up(progress=None):
+    """
+    Load the sentence tokenizer, POS tagger and WordNet so the first detection run
+    does not pay for them. progress, if given, is called as progress(done, total, name)
+    after each model is ready.
+    """
+    steps = [
+        ("tokenizer", lambda: word_tokenize(sent_tokenize("Warm up the tokenizer. It is ready.")[0])),
+        ("tagger", lambda: get_tagger().tag(["We", "may", "show", "it"])),
+        ("wordnet", lambda: get_lemmatizer().lemmatize("showing", pos="v")),
+    ]
+    for i, (name, step) in enumerate(steps, 1):
+        step()
+        if progress:
+            progress(i, len(steps), name)
+
+# Safe chunk boundaries: a '--- Page N ---' banner line or a blank line
+CHUNK_BOUNDARY = re.compile(r"\n(?=[ \t]*-{2,}\s*page\s*\d+\s*-{2,})|\n[ \t]*\n", re.IGNORECASE)
+
+def _analyze_chunk(chunk, tag=True):
+    """Worker: clean, sentence-split and (with tag) tokenize, tag and lemmatize one chunk of raw text."""
+    sents = sent_tokenize(" ".join(chunk.split()))
+    if not tag:
+        return sents, [None] * len(sents)
+    tokenized = [word_tokenize(s) for s in sents]
+    tagged = get_tagger().tag_sents(tokenized)
+    return sents, [(toks, [t for _, t in pairs], [lemmatize(w, t) for w, t in pairs])
+                   for toks, pairs in zip(tokenized, tagged)]
+
+_pool_lock = Lock()
+_pool_state = {"workers": 0, "executor": None}
+
+def _pool(workers):
+    # One warm pool, reused across documents; asking for another size replaces it
+    with _pool_lock:
+        if _pool_state["workers"] != workers:
+            if _pool_state["executor"] is not None:
+                _pool_state["executor"].shutdown(wait=False)  # chunks already queued still finish
+            _pool_state.update(workers=workers, executor=ProcessPoolExecutor(max_workers=workers, initializer=warm_up))
+        return _pool_state["executor"]
+
+@atexit.register
+def shutdown_pool():
+    """Stop the worker processes analyze_parallel() keeps warm; the next call starts a new pool."""
+    with _pool_lock:
+        executor, _pool_state["executor"], _pool_state["workers"] = _pool_state["executor"], None, 0
+    if executor is not None:
+        executor.shutdown()
 
 class TextPreprocessor:
-    def __init__(self, text):
+    def __init__(self, text, strip_boilerplate=False):
+        # Optionally drop running headers/footers/page numbers first
+        self.boilerplate_removed = 0
+        if strip_boilerplate:
+            text, self.boilerplate_removed = _strip_boilerplate(text)
         self.text = text
     
     def clean_text(self):
         # Remove unwanted spaces/newlines
         return " ".join(self.text.split())
     
-    def tokenize_sentences(self):
-        return sent_tokenize(self.clean_text())
+    def tokenize_sentences(self, cleaned=None):
+        # Pass an already cleaned text to avoid cleaning twice
+        return sent_tokenize(self.clean_text() if cleaned is None else cleaned)
     
     def tokenize_words(self, sentence):
         return word_tokenize(sentence)
     
     def pos_tag_sentence(self, sentence):
         words = self.tokenize_words(sentence)
-        return pos_tag(words)
+        return get_tagger().tag(words)
+
+    def chunks(self, chunk_chars=100_000):
+        """Raw text cut at page banners / blank lines into pieces of at least chunk_chars (except the last)."""
+        pieces, start = [], 0
+        for m in CHUNK_BOUNDARY.finditer(self.text):
+            if m.start() - start >= chunk_chars:
+                pieces.append(self.text[start:m.start()])
+                start = m.start()
+        pieces.append(self.text[start:])
+        return [p for p in pieces if p.strip()]
+
+    def analyze_parallel(self, workers=4, chunk_chars=100_000, tag=True):
+        """
+        Sentences of clean_text() plus {sentence: (tokens, tags, lemmas)}, with chunks segmented and
+        (unless tag is False, which returns no analyses) tagged in a process pool. Chunk results are merged in order; each seam is re-split with
+        sent_tokenize (Punkt decides a boundary from the tokens around it), so the sentence list is
+        exactly tokenize_sentences()' and sentence offsets stay global in the joined clean text.
+        """
+        chunks = self.chunks(chunk_chars)
+        if workers < 2 or len(chunks) < 2:
+            sents, analyses = _analyze_chunk(self.text, tag)
+            return sents, {s: a for s, a in zip(sents, analyses) if a is not None}
+        sentences, analyses = [], {}
+        for sents, results in _pool(workers).map(partial(_analyze_chunk, tag=tag), chunks):
+            if sentences and sents:
+                # The cleaned chunks are joined by one space, as in clean_text()
+                seam = sent_tokenize(sentences[-1] + " " + sents[0])
+                if seam != [sentences[-1], sents[0]]:
+                    sentences.pop()
+                    sents, results = seam + sents[1:], [None] * len(seam) + results[1:]
+            for sent, result in zip(sents, results):
+                sentences.append(sent)
+                if result is not None:
+                    analyses[sent] = result
+        return sentences, analyses
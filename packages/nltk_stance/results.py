@@ -0,0 +1,272 @@
+# nltk_stance/results.py
+from array import array
+
+MARKER_KEYS = ("stance_type", "cue", "start", "end")
+SENTENCE_KEYS = ("sentence", "markers", "section", "page")
+NO_PAGE = -1
+
+class _RecordView:
+    """Read-only, dict-compatible view of one record in a DetectionResults."""
+    __slots__ = ("_r", "_i")
+    _keys = ()
+
+    def __init__(self, results, index):
+        self._r = results
+        self._i = index
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._keys else default
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def keys(self):
+        return self._keys
+
+    def items(self):
+        return [(k, getattr(self, k)) for k in self._keys]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (dict, _RecordView)):
+            return self.to_dict() == (other if isinstance(other, dict) else other.to_dict())
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+class MarkerView(_RecordView):
+    __slots__ = ()
+    _keys = MARKER_KEYS
+
+    @property
+    def stance_type(self):
+        return self._r.stance_types[self._r.m_type[self._i]]
+
+    @property
+    def cue(self):
+        return self._r.cues[self._r.m_cue[self._i]]
+
+    @property
+    def start(self):
+        return self._r.m_start[self._i]
+
+    @property
+    def end(self):
+        return self._r.m_end[self._i]
+
+    def to_dict(self):
+        return {"stance_type": self.stance_type, "cue": self.cue, "start": self.start, "end": self.end}
+
+class SentenceView(_RecordView):
+    __slots__ = ()
+    _keys = SENTENCE_KEYS
+
+    @property
+    def sentence(self):
+        r = self._r
+        return r.text[r.sent_start[self._i]:r.sent_end[self._i]]
+
+    @property
+    def markers(self):
+        r = self._r
+        return [MarkerView(r, j) for j in range(r.marker_offset[self._i], r.marker_offset[self._i + 1])]
+
+    @property
+    def section(self):
+        return self._r.sections[self._r.sent_section[self._i]]
+
+    @property
+    def page(self):
+        page = self._r.sent_page[self._i]
+        return None if page == NO_PAGE else page
+
+    @property
+    def printed_page(self):
+        # Not one of the dict keys: the CSV schema only carries the PDF page
+        page = self._r.sent_printed[self._i]
+        return None if page == NO_PAGE else page
+
+    @property
+    def offset(self):
+        return self._r.sent_start[self._i]
+
+    def to_dict(self):
+        return {"sentence": self.sentence, "markers": [m.to_dict() for m in self.markers],
+                "section": self.section, "page": self.page}
+
+def _page_number(page) -> int:
+    if page is None or page == "":
+        return NO_PAGE
+    try:
+        number = int(page)
+    except (TypeError, ValueError):
+        number = None
+    if number is None or isinstance(page, float) and page != number or number < 0:
+        raise ValueError(f"page must be a PDF page number, got {page!r}")
+    return number
+
+class DetectionResults:
+    """
+    Column-oriented detect_stance_markers() output. Sentences are (start, end) offsets into one
+    shared source text; stance types, cues and sections are interned into small code tables;
+    markers live in typed arrays with a CSR-style marker_offset per sentence. Indexing and
+    iteration yield __slots__ views that behave like the original dicts (item["markers"],
+    item.get("page"), m["cue"]), and to_dicts() rebuilds the plain-list form exactly.
+    """
+
+    def __init__(self, text: str = ""):
+        self.text = text
+        self._cursor = 0
+        self.stance_types, self._type_codes = [], {}
+        self.cues, self._cue_codes = [], {}
+        self.sections, self._section_codes = [None], {None: 0}
+        self.sent_start = array("I")
+        self.sent_end = array("I")
+        self.sent_section = array("H")
+        self.sent_page = array("i")
+        self.sent_printed = array("i")
+        self.marker_offset = array("I", [0])
+        self.m_type = array("B")
+        self.m_cue = array("I")
+        self.m_start = array("I")
+        self.m_end = array("I")
+
+    @staticmethod
+    def _code(table, codes, value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+        return code
+
+    def append(self, sentence: str, markers, section: str = None, page: int = None):
+        """
+        Add one sentence with its (stance_type, cue, start, end) markers, in detection order.
+        `page` is a PDF page number: an int, a digit string (as read back from a CSV), or None/"".
+        Anything else, e.g. a printed roman numeral, raises ValueError.
+        """
+        pos = self.text.find(sentence, self._cursor)
+        if pos == -1:
+            # Not a slice of the source (e.g. built by hand): keep it at the end of the buffer
+            pos = len(self.text)
+            self.text += sentence
+        end = pos + len(sentence)
+        self._cursor = end
+        self.sent_start.append(pos)
+        self.sent_end.append(end)
+        self.sent_section.append(self._code(self.sections, self._section_codes, section))
+        self.sent_page.append(_page_number(page))
+        self.sent_printed.append(NO_PAGE)
+        for stype, cue, s, e in markers:
+            self.m_type.append(self._code(self.stance_types, self._type_codes, stype))
+            self.m_cue.append(self._code(self.cues, self._cue_codes, cue))
+            self.m_start.append(s)
+            self.m_end.append(e)
+        self.marker_offset.append(len(self.m_type))
+
+    def extend(self, other: "DetectionResults"):
+        """Append another container (e.g. the next section of a thesis); its text is appended too."""
+        base, mbase = len(self.text), len(self.m_type)
+        self.text += other.text
+        self._cursor = len(self.text)
+        types = [self._code(self.stance_types, self._type_codes, t) for t in other.stance_types]
+        cues = [self._code(self.cues, self._cue_codes, c) for c in other.cues]
+        sections = [self._code(self.sections, self._section_codes, s) for s in other.sections]
+        self.sent_start.extend(s + base for s in other.sent_start)
+        self.sent_end.extend(e + base for e in other.sent_end)
+        self.sent_section.extend(sections[c] for c in other.sent_section)
+        self.sent_page.extend(other.sent_page)
+        self.sent_printed.extend(other.sent_printed)
+        self.marker_offset.extend(o + mbase for o in other.marker_offset[1:])
+        self.m_type.extend(types[c] for c in other.m_type)
+        self.m_cue.extend(cues[c] for c in other.m_cue)
+        self.m_start.extend(other.m_start)
+        self.m_end.extend(other.m_end)
+
+    def attribute(self, index):
+        """
+        Fill page, printed page and section for every sentence from a PageIndex built on the
+        same text, looking each sentence up by its start offset. Sentences the index cannot
+        place keep their current values.
+        """
+        for i in range(len(self)):
+            pdf, printed, section = index.locate(self.sent_start[i])
+            if pdf is None:
+                continue
+            self.sent_page[i] = pdf
+            self.sent_printed[i] = NO_PAGE if printed is None else printed
+            if section is not None:
+                self.sent_section[i] = self._code(self.sections, self._section_codes, section)
+        return self
+
+    def filter(self, keep) -> "DetectionResults":
+        """New container (same text) with the sentences whose view satisfies keep(view)."""
+        out = DetectionResults(self.text)
+        out.stance_types, out._type_codes = list(self.stance_types), dict(self._type_codes)
+        out.cues, out._cue_codes = list(self.cues), dict(self._cue_codes)
+        out.sections, out._section_codes = list(self.sections), dict(self._section_codes)
+        for i in range(len(self)):
+            if not keep(SentenceView(self, i)):
+                continue
+            out.sent_start.append(self.sent_start[i])
+            out.sent_end.append(self.sent_end[i])
+            out.sent_section.append(self.sent_section[i])
+            out.sent_page.append(self.sent_page[i])
+            out.sent_printed.append(self.sent_printed[i])
+            lo, hi = self.marker_offset[i], self.marker_offset[i + 1]
+            out.m_type.extend(self.m_type[lo:hi])
+            out.m_cue.extend(self.m_cue[lo:hi])
+            out.m_start.extend(self.m_start[lo:hi])
+            out.m_end.extend(self.m_end[lo:hi])
+            out.marker_offset.append(len(out.m_type))
+        out._cursor = out.sent_end[-1] if len(out) else 0
+        return out
+
+    def __len__(self):
+        return len(self.sent_start)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [SentenceView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return SentenceView(self, index)
+
+    def __iter__(self):
+        return (SentenceView(self, i) for i in range(len(self)))
+
+    def __bool__(self):
+        return len(self) > 0
+
+    @property
+    def marker_count(self):
+        return len(self.m_type)
+
+    def rows(self):
+        """One (sentence, stance_type, cue, start, end, section, page) tuple per marker, without views."""
+        text, types, cues, sections = self.text, self.stance_types, self.cues, self.sections
+        for i in range(len(self)):
+            sent = text[self.sent_start[i]:self.sent_end[i]]
+            section = sections[self.sent_section[i]]
+            page = None if self.sent_page[i] == NO_PAGE else self.sent_page[i]
+            for j in range(self.marker_offset[i], self.marker_offset[i + 1]):
+                yield (sent, types[self.m_type[j]], cues[self.m_cue[j]], self.m_start[j], self.m_end[j], section, page)
+
+    def to_dicts(self):
+        return [view.to_dict() for view in self]
+
+    def nbytes(self) -> int:
+        """Approximate size of the arrays (the shared source text is not counted)."""
+        arrays = (self.sent_start, self.sent_end, self.sent_section, self.sent_page, self.sent_printed, self.marker_offset,
+                  self.m_type, self.m_cue, self.m_start, self.m_end)
+        return sum(a.itemsize * len(a) for a in arrays)
@@ -1,11 +1,11 @@
 # packages/nltk_stance/stance_detector.py
 import csv, os, re
 from typing import List, Dict, Tuple
-from nltk import pos_tag
-from nltk.stem import WordNetLemmatizer
 
-from packages.nltk_stance.preprocessor import TextPreprocessor
+from packages.nltk_stance.preprocessor import TextPreprocessor, get_tagger, lemmatize
 from packages.nltk_stance.stance_lexicon import STANCE_LEXICON
+from packages.nltk_stance.results import DetectionResults
+from packages.nltk_stance.attribution import PageIndex
 
 # Optional: sections/headings typically not argumentative
 SECTION_EXCLUDE = {
@@ -33,13 +33,67 @@ LEMMA_UNIGRAMS = {
     "self_mention": {"i", "we", "our", "my", "us"}
 }
 
+CSV_FIELDS = ["sentence", "stance_type", "cue", "start", "end", "section", "page"]
+
+def write_results_csv(results: List[Dict], filename: str):
+    """Write detect_stance_markers() output (from one or many detectors) as one row per marker."""
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    if isinstance(results, DetectionResults):
+        # Stream straight from the arrays instead of building one dict per row
+        with open(filename, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDS)
+            writer.writerows(results.rows())
+        return
+    rows = []
+    for item in results:
+        sent = item["sentence"]
+        section = item.get("section")
+        page = item.get("page")
+        for m in item["markers"]:
+            rows.append({
+                "sentence": sent,
+                "stance_type": m["stance_type"],
+                "cue": m["cue"],
+                "start": m["start"],
+                "end": m["end"],
+                "section": section,
+                "page": page
+            })
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
 class StanceDetector:
-    def __init__(self, text, section_name: str = None, page: int = None):
-        self.preprocessor = TextPreprocessor(text)
-        self.sentences = self.preprocessor.tokenize_sentences()
+    def __init__(self, text, section_name: str = None, page: int = None, strip_boilerplate: bool = False,
+                 analysis_cache=None, workers: int = None, tagger="full", chunk_chars: int = 100_000):
+        # tagger: "full" (NLTK perceptron), "coarse" (the trained CoarseTagger) or a CoarseTagger
+        self._coarse = None
+        if tagger == "coarse":
+            from packages.nltk_stance.coarse_tagger import get_coarse_tagger
+            self._coarse = get_coarse_tagger()
+        elif tagger != "full":
+            self._coarse = tagger
+        self.preprocessor = TextPreprocessor(text, strip_boilerplate=strip_boilerplate)
+        self.clean_text = self.preprocessor.clean_text()
+        # Optional AnalysisCache: reuses sentence splits, tokens, tags and lemmas across runs
+        self.analysis_cache = analysis_cache
+        self._analyses = {}
+        self.sentences = analysis_cache.get_sentences(self.clean_text) if analysis_cache else None
+        if self.sentences is None:
+            if workers and workers > 1:
+                # Segment (and, for the full tagger, tag) chunks of one large document in parallel;
+                # same sentences as below. The coarse tagger only takes the split from the pool.
+                self.sentences, self._analyses = self.preprocessor.analyze_parallel(
+                    workers, chunk_chars, tag=self._coarse is None)
+            else:
+                self.sentences = self.preprocessor.tokenize_sentences(self.clean_text)
+            if analysis_cache:
+                analysis_cache.put_sentences(self.clean_text, self.sentences)
+                analysis_cache.put_many(self._analyses)
         self.section_name = section_name
         self.page = page
-        self._wnl = WordNetLemmatizer()
 
     # ---------- Internal helpers ----------
     def _exclude_sentence(self, sent: str) -> bool:
@@ -66,8 +120,7 @@ class StanceDetector:
         return any(n in seg for n in ("not", "n't", "no", "never", "cannot", "can’t", "can´t"))
 
     def _lemmatize(self, token: str, pos_tag_: str) -> str:
-        pos = 'v' if pos_tag_.startswith('V') else 'n' if pos_tag_.startswith('N') else 'a' if pos_tag_.startswith('J') else 'r'
-        return self._wnl.lemmatize(token.lower(), pos=pos)
+        return lemmatize(token, pos_tag_)
 
     def _match_multiword(self, tokens: List[str]) -> List[Tuple[str, str, int, int]]:
         hits = []
@@ -80,10 +133,36 @@ class StanceDetector:
                         hits.append((stype, " ".join(pat), i, i+n))
         return hits
 
-    def _match_unigrams(self, tokens: List[str], tags: List[str]) -> List[Tuple[str, str, int, int]]:
+    def _analyze(self, sent: str) -> Tuple[List[str], List[str], List[str]]:
+        """Tokens, POS tags and lemmas: everything per sentence that does not depend on the lexicon."""
+        tokens = self.preprocessor.tokenize_words(sent)
+        if not tokens:
+            return [], [], []
+        tags = self._tag_sents([tokens])[0]
+        return tokens, tags, [self._lemmatize(tok, pos) for tok, pos in zip(tokens, tags)]
+
+    def _tag_sents(self, sentences: List[List[str]]) -> List[List[str]]:
+        if self._coarse is not None:
+            return self._coarse.tag_sents(sentences)
+        return [[t for _, t in tagged] for tagged in get_tagger().tag_sents(sentences)]
+
+    def analyze_many(self, sentences) -> Dict[str, Tuple[List[str], List[str], List[str]]]:
+        """_analyze() for many sentences (duplicates analysed once), tagged in one tag_sents() call."""
+        out, tokenized = {}, []
+        for sent in dict.fromkeys(sentences):
+            tokens = self.preprocessor.tokenize_words(sent)
+            out[sent] = ([], [], [])
+            if tokens:
+                tokenized.append((sent, tokens))
+        for (sent, tokens), tags in zip(tokenized, self._tag_sents([t for _, t in tokenized])):
+            out[sent] = (tokens, tags, [self._lemmatize(tok, pos) for tok, pos in zip(tokens, tags)])
+        return out
+
+    def _match_unigrams(self, tokens: List[str], tags: List[str], lemmas: List[str] = None) -> List[Tuple[str, str, int, int]]:
         hits = []
         lows = [t.lower() for t in tokens]
-        lemmas = [self._lemmatize(tok, pos) for tok, pos in zip(tokens, tags)]
+        if lemmas is None:
+            lemmas = [self._lemmatize(tok, pos) for tok, pos in zip(tokens, tags)]
         for i, (tok, low, lem, pos) in enumerate(zip(tokens, lows, lemmas, tags)):
             # Self-mention: prefer standalone pronouns (PRP/PRP$) and sentence-initial positions
             if low in LEMMA_UNIGRAMS["self_mention"]:
@@ -102,7 +181,19 @@ class StanceDetector:
         return hits
 
     # ---------- Public API ----------
-    def detect_stance_markers(self) -> List[Dict]:
+    def detect_stance_markers(self, progress=None, every: int = 50) -> List[Dict]:
+        """
+        progress, if given, is called as progress(sentences_done, sentence_count)
+        every `every` sentences and once at the end.
+        """
+        return self.detect_compact(progress, every).to_dicts()
+
+    def detect_stance_markers_reference(self) -> List[Dict]:
+        """
+        The original per-sentence loop (one tag() call and one list of dicts per sentence), kept
+        unchanged as the oracle that detect_compact() and the evaluation modes are checked
+        against. Slow; not for production use.
+        """
         results = []
         for sent in self.sentences:
             if self._exclude_sentence(sent):
@@ -111,7 +202,7 @@ class StanceDetector:
             if not tokens:
                 continue
             # POS tag the sentence
-            pos_tags = [t for _, t in pos_tag(tokens)]
+            pos_tags = [t for _, t in get_tagger().tag(tokens)]
             # Collect hits
             spans = {}
             for stype, cue, s, e in self._match_multiword(tokens):
@@ -129,32 +220,61 @@ class StanceDetector:
                 })
         return results
 
-    def count_stance_types(self) -> Dict[str, int]:
+    def detect_document(self, thesis_path: str = None, progress=None, every: int = 50) -> DetectionResults:
+        """
+        One detection pass over a whole extracted document, with each sentence attributed to
+        its PDF page (from the '--- Page N ---' banners), printed page and section (from the
+        TOC of thesis_path, usually the file this text was read from).
+        """
+        results = self.detect_compact(progress, every)
+        return results.attribute(PageIndex.from_thesis(self.clean_text, thesis_path))
+
+    def detect_compact(self, progress=None, every: int = 50, analyses=None) -> DetectionResults:
+        """
+        Same detections as detect_stance_markers(), stored as a compact DetectionResults.
+        analyses, if given, maps sentences to precomputed (tokens, tags, lemmas) (see analyze_many()).
+        """
+        results = DetectionResults(self.clean_text)
+        total = len(self.sentences)
+        cached, fresh = {**self._analyses, **(analyses or {})}, {}
+        # Cached analyses carry full-tagger tags, so the coarse tagger neither reads nor writes them
+        cache = self.analysis_cache if self._coarse is None else None
+        if cache:
+            cached.update(cache.get_many(
+                s for s in self.sentences if s not in cached and not self._exclude_sentence(s)))
+        for n, sent in enumerate(self.sentences, 1):
+            if progress and n % every == 0:
+                progress(n, total)
+            if self._exclude_sentence(sent):
+                continue
+            analysis = cached.get(sent)
+            if analysis is None:
+                analysis = fresh[sent] = self._analyze(sent)
+            tokens, pos_tags, lemmas = analysis
+            if not tokens:
+                continue
+            # Collect hits
+            spans = {}
+            for stype, cue, s, e in self._match_multiword(tokens):
+                spans[(s, e, stype, cue)] = (stype, cue, s, e)
+            for stype, cue, s, e in self._match_unigrams(tokens, pos_tags, lemmas):
+                spans.setdefault((s, e, stype, cue), (stype, cue, s, e))
+            if spans:
+                results.append(sent, spans.values(), self.section_name, self.page)
+        if cache and fresh:
+            cache.put_many(fresh)
+        if progress:
+            progress(total, total)
+        return results
+
+    def count_stance_types(self, results: List[Dict] = None) -> Dict[str, int]:
+        """Marker counts per stance type; pass `results` to reuse an earlier detect_stance_markers() run."""
         counts = {"hedging": 0, "boosting": 0, "attitude": 0, "self_mention": 0}
-        for item in self.detect_stance_markers():
+        for item in (results if results is not None else self.detect_stance_markers()):
             for m in item["markers"]:
-                counts[m["stance_type"]] += 1
+                counts[m["stance_type"]] = counts.get(m["stance_type"], 0) + 1
         return counts
 
-    def export_to_csv(self, filename: str = "output/stance_results.csv"):
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        rows = []
-        for item in self.detect_stance_markers():
-            sent = item["sentence"]
-            section = item.get("section")
-            page = item.get("page")
-            for m in item["markers"]:
-                rows.append({
-                    "sentence": sent,
-                    "stance_type": m["stance_type"],
-                    "cue": m["cue"],
-                    "start": m["start"],
-                    "end": m["end"],
-                    "section": section,
-                    "page": page
-                })
-        fieldnames = ["sentence", "stance_type", "cue", "start", "end", "section", "page"]
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(rows)
+    def export_to_csv(self, filename: str = "output/stance_results.csv", results: List[Dict] = None):
+        """Write one row per marker; pass `results` to reuse an earlier detect_stance_markers() run."""
+        write_results_csv(results if results is not None else self.detect_stance_markers(), filename)
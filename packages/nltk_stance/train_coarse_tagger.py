@@ -0,0 +1,61 @@
+# nltk_stance/train_coarse_tagger.py
+import argparse, os, random, time
+from pathlib import Path
+
+from packages.nltk_stance.preprocessor import TextPreprocessor, get_tagger
+from packages.nltk_stance.coarse_tagger import CoarseTagger, COARSE_MODEL_PATH
+
+def load_sentences(paths, max_sentences=None):
+    """Tokenized sentences from .txt files (or every .txt in a directory), in file order."""
+    files = []
+    for p in paths:
+        files += sorted(Path(p).glob("*.txt")) if os.path.isdir(p) else [Path(p)]
+    sentences = []
+    for path in files:
+        pre = TextPreprocessor(path.read_text(encoding="utf-8"), strip_boilerplate=True)
+        for sent in pre.tokenize_sentences():
+            tokens = pre.tokenize_words(sent)
+            if tokens:
+                sentences.append(tokens)
+        if max_sentences and len(sentences) >= max_sentences:
+            return sentences[:max_sentences]
+    return sentences
+
+def main():
+    p = argparse.ArgumentParser(description="Train the coarse POS tagger from the full perceptron tagger's output")
+    p.add_argument("texts", nargs="+", help="Extracted .txt files or folders of them")
+    p.add_argument("--out", default=COARSE_MODEL_PATH, help="Model path (.npz)")
+    p.add_argument("--holdout", type=float, default=0.1, help="Share of sentences kept for the agreement report")
+    p.add_argument("--epochs", type=int, default=4)
+    p.add_argument("--max-sentences", type=int, default=None)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    sentences = load_sentences(args.texts, args.max_sentences)
+    random.Random(args.seed).shuffle(sentences)
+    n_test = int(len(sentences) * args.holdout)
+    test, train = sentences[:n_test], sentences[n_test:]
+    print(f"{len(train)} training / {len(test)} held-out sentences")
+
+    tagger = get_tagger()
+    start = time.perf_counter()
+    train_tags = [[t for _, t in s] for s in tagger.tag_sents(train)]
+    test_tags = [[t for _, t in s] for s in tagger.tag_sents(test)]
+    full_s = time.perf_counter() - start
+
+    model = CoarseTagger().fit(train, train_tags, epochs=args.epochs, seed=args.seed, log=print)
+    model.save(args.out)
+
+    start = time.perf_counter()
+    model.tag_sents(train + test)
+    coarse_s = time.perf_counter() - start
+    n_tokens = sum(len(s) for s in train + test)
+    report = model.agreement(test, test_tags) if test else model.agreement(train, train_tags)
+    print(f"\nSaved {args.out}")
+    print(f"Agreement with the full tagger ({'held-out' if test else 'training'} tokens):")
+    for cls, share in report.items():
+        print(f"  {cls:<5}{share:8.2%}")
+    print(f"Tokens/s: full {n_tokens / full_s:,.0f}  coarse {n_tokens / coarse_s:,.0f}")
+
+if __name__ == "__main__":
+    main()
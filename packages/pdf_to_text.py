@@ -20,10 +20,11 @@ class PDFExtractor:
         return [f for f in os.listdir(directory) if f.lower().endswith(".pdf")]
 
     @staticmethod
-    def extract_text(pdf_file, output_dir="extracted_txt"):
+    def extract_text(pdf_file, output_dir="extracted_txt", progress=None):
         """
         Extract all text from a single PDF and save it as a .txt file.
         Usage: PDFExtractor.extract_text("file.pdf")
+        progress, if given, is called as progress(pages_done, page_count) after each page.
         """
         os.makedirs(output_dir, exist_ok=True)
         doc = fitz.open(pdf_file)
@@ -39,22 +40,37 @@ class PDFExtractor:
                 f.write(f"\n--- Page {page_num+1} ---\n")
                 f.write(text)
                 f.write("\n")
+                if progress:
+                    progress(page_num + 1, len(doc))
 
         return output_path
 
     # ---- INSTANCE METHOD ----
-    def extract_multiple(self, pdf_list=None):
+    def extract_multiple(self, pdf_list=None, progress=None):
         """
         Extract text from multiple PDFs in this instance's directory.
         If no list is given, all PDFs in directory are processed.
+        progress, if given, is called as progress(pages_done, total_pages, pdf_name)
+        with pages counted over all PDFs.
         """
         if pdf_list is None:
             pdf_list = PDFExtractor.list_pdfs(self.directory)
 
+        paths = [os.path.join(self.directory, pdf) for pdf in pdf_list]
+        counts = []
+        if progress:
+            for pdf_path in paths:
+                with fitz.open(pdf_path) as doc:
+                    counts.append(len(doc))
+        total = sum(counts)
+
         results = []
-        for pdf in pdf_list:
-            pdf_path = os.path.join(self.directory, pdf)
-            out = PDFExtractor.extract_text(pdf_path, self.output_dir)
+        for i, (pdf, pdf_path) in enumerate(zip(pdf_list, paths)):
+            page_cb = None
+            if progress:
+                base = sum(counts[:i])
+                page_cb = lambda n, _count, base=base, name=pdf: progress(base + n, total, name)
+            out = PDFExtractor.extract_text(pdf_path, self.output_dir, progress=page_cb)
             results.append(out)
         return results
     
@@ -0,0 +1,32 @@
+# tests/conftest.py
+import re, sys, types
+
+import pytest
+
+try:
+    import google.generativeai  # noqa: F401
+except ImportError:
+    # gemini_validator imports the SDK at module level; tests that reach it replace it with a fake
+    google = sys.modules.setdefault("google", types.ModuleType("google"))
+    google.generativeai = sys.modules["google.generativeai"] = types.ModuleType("google.generativeai")
+
+TAGS = {"we": "PRP", "our": "PRP$", "may": "MD", "might": "MD", "show": "VB", "perhaps": "RB", "clear": "JJ"}
+
+class _ToyTagger:
+    def tag(self, tokens):
+        return [(w, TAGS.get(w.lower(), "NN")) for w in tokens]
+
+    def tag_sents(self, sentences):
+        return [self.tag(s) for s in sentences]
+
+@pytest.fixture
+def toy_detector(monkeypatch):
+    """Deterministic stand-ins for Punkt, the word tokenizer, the tagger and WordNet."""
+    P = pytest.importorskip("packages.nltk_stance.preprocessor")
+    from packages.nltk_stance import stance_detector as SD
+    tokenize = lambda s: re.findall(r"\w+|[^\w\s]", s)
+    monkeypatch.setattr(P, "sent_tokenize", lambda t: [s for s in re.split(r"(?<=[.!?])\s+", t) if s])
+    monkeypatch.setattr(P, "word_tokenize", tokenize)
+    for module in (P, SD):
+        monkeypatch.setattr(module, "get_tagger", lambda: _ToyTagger())
+        monkeypatch.setattr(module, "lemmatize", lambda w, t: w.lower())
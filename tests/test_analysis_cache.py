@@ -0,0 +1,58 @@
+# tests/test_analysis_cache.py
+import pytest
+
+from packages.nltk_stance.analysis_cache import AnalysisCache
+
+ANALYSIS = {"We may see.": (["We", "may", "see", "."], ["PRP", "MD", "VB", "."], ["we", "may", "see", "."]),
+            "Results were shown.": (["Results", "were", "shown", "."], ["NNS", "VBD", "VBN", "."],
+                                    ["result", "be", "show", "."])}
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "analysis.sqlite")
+
+def test_hits_and_misses(path):
+    cache = AnalysisCache(path, version="a")
+    assert cache.get_many(ANALYSIS) == {}
+    cache.put_many(ANALYSIS)
+    assert cache.get_many(list(ANALYSIS) + ["Unseen."]) == ANALYSIS
+    assert cache.get_many(["Unseen."]) == {}
+    cache.close()
+
+def test_separator_tokens_are_not_stored(path):
+    cache = AnalysisCache(path, version="a")
+    cache.put_many({"odd": (["a\x1fb"], ["NN"], ["a\x1fb"])})
+    assert cache.get_many(["odd"]) == {}
+
+def test_sentence_splits(path):
+    cache = AnalysisCache(path, version="a")
+    text = "We may see.  Results were shown."
+    assert cache.get_sentences(text) is None
+    cache.put_sentences(text, ["We may see.", "Results were shown."])
+    assert cache.get_sentences(text) == ["We may see.", "Results were shown."]
+    cache.put_sentences("a b", ["a", "x"])  # not slices of the text: nothing stored
+    assert cache.get_sentences("a b") is None
+
+def test_model_version_change_empties_the_cache(path):
+    cache = AnalysisCache(path, version="a")
+    cache.put_many(ANALYSIS)
+    cache.put_sentences("We may see.", ["We may see."])
+    cache.close()
+    cache = AnalysisCache(path, version="a")
+    assert cache.get_many(ANALYSIS) == ANALYSIS
+    cache.close()
+    cache = AnalysisCache(path, version="b")
+    assert cache.get_many(ANALYSIS) == {} and cache.get_sentences("We may see.") is None
+    cache.close()
+    assert AnalysisCache(path, version="a").get_many(ANALYSIS) == {}  # switching back does not revive entries
+
+def test_detector_rerun_is_served_from_the_cache(toy_detector, monkeypatch):
+    from packages.nltk_stance import preprocessor as P, stance_detector as SD
+    text = "We may show that it works. Our data might perhaps agree."
+    cache = AnalysisCache(":memory:", version="a")
+    first = SD.StanceDetector(text, analysis_cache=cache).detect_compact().to_dicts()
+    assert first
+    fail = lambda *a, **k: pytest.fail("a cached rerun must not split or tag")
+    monkeypatch.setattr(P, "sent_tokenize", fail)
+    monkeypatch.setattr(SD, "get_tagger", fail)
+    assert SD.StanceDetector(text, analysis_cache=cache).detect_compact().to_dicts() == first
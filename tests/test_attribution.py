@@ -0,0 +1,32 @@
+# tests/test_attribution.py
+from packages.nltk_stance.attribution import PageIndex
+
+TEXT = "title page\n--- Page 1 ---\nfront\n--- Page 2 ---\nchapter one\n---page 3---\nmore\n--- Page 5 ---\nnext\n"
+TOC = [("Introduction", 1, 2), ("Methods", 4, 5)]
+PAGE_MAP = {1: 2, 2: 3, 4: 5, 3: 4}
+
+def _at(marker):
+    return TEXT.index(marker)
+
+def test_locate_at_banner_boundaries():
+    index = PageIndex(TEXT, TOC, PAGE_MAP)
+    assert index.locate(0) == (None, None, None)  # before the first banner
+    assert index.locate(_at("--- Page 1") - 1) == (None, None, None)
+    assert index.locate(_at("--- Page 1")) == (1, None, None)  # the banner belongs to its page
+    assert index.locate(_at("front")) == (1, None, None)  # front matter: before the first TOC entry
+    assert index.locate(_at("--- Page 2") - 1) == (1, None, None)
+    assert index.locate(_at("--- Page 2")) == (2, 1, "Introduction")
+    assert index.locate(_at("---page 3---")) == (3, 2, "Introduction")  # loose banner spacing
+    assert index.locate(_at("--- Page 5") - 1) == (3, 2, "Introduction")
+    assert index.locate(_at("next")) == (5, 4, "Methods")
+    assert index.locate(len(TEXT)) == (5, 4, "Methods")
+
+def test_index_without_banners_or_toc():
+    assert not PageIndex("no banners here")
+    assert PageIndex("no banners here").locate(3) == (None, None, None)
+    index = PageIndex(TEXT)
+    assert index and index.locate(_at("next")) == (5, None, None)
+
+def test_lowest_printed_number_wins_per_pdf_page():
+    index = PageIndex(TEXT, TOC, {7: 5, 4: 5})
+    assert index.locate(_at("next"))[1] == 4
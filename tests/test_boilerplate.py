@@ -0,0 +1,62 @@
+# tests/test_boilerplate.py
+import pytest
+
+from packages.nltk_stance.attribution import PageIndex
+from packages.nltk_stance.boilerplate import find_boilerplate, strip_boilerplate
+
+HEADER = "Stance in Academic Writing | Chapter 2"
+REPEATED = "We may suggest that the effect is robust."
+WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda omicron sigma omega".split()
+
+def _body(page):
+    # Distinct words per line and page: digit masking must not make body lines look alike
+    return [f"The {WORDS[(page + i) % len(WORDS)]} {WORDS[(page * 3 + i) % len(WORDS)]} result on sheet {page} line {i} might hold."
+            for i in range(6)]
+
+def _document(pages, first=1):
+    lines = []
+    for n in range(first, first + pages):
+        body = _body(n)
+        lines += [f"--- Page {n} ---", HEADER, *body[:3], REPEATED, *body[3:], str(n + 10)]
+    return "\n".join(lines) + "\n"
+
+def test_running_headers_and_page_numbers_are_removed():
+    text = _document(6)
+    stripped, removed = strip_boilerplate(text)
+    assert removed == 12
+    assert HEADER not in stripped
+    assert not any(line.strip().isdigit() for line in stripped.splitlines())
+    assert stripped.count("--- Page ") == 6  # banners survive
+    assert all(line in stripped for n in range(1, 7) for line in _body(n))
+
+def test_repeated_body_lines_away_from_page_edges_are_kept():
+    stripped, _ = strip_boilerplate(_document(6))
+    assert stripped.count(REPEATED) == 6
+
+def test_min_pages():
+    assert strip_boilerplate(_document(2)) == (_document(2), 0)
+    lines = _document(4).splitlines()
+    assert find_boilerplate(lines, min_pages=5) == set()
+    assert len(find_boilerplate(lines, min_pages=4)) == 8
+
+def test_text_without_banners_is_untouched():
+    text = "\n".join([HEADER, "Body text.", HEADER] * 5)
+    assert strip_boilerplate(text) == (text, 0)
+
+def test_attribution_after_stripping(toy_detector):
+    from packages.nltk_stance.stance_detector import StanceDetector
+    text = _document(5, first=3)
+    det = StanceDetector(text, strip_boilerplate=True)
+    assert det.preprocessor.boilerplate_removed == 10
+    toc = [("Introduction", 1, 3), ("Methods", 3, 5)]
+    results = det.detect_compact().attribute(PageIndex(det.clean_text, toc))
+    expected = {" ".join(line.split()): n for n in range(3, 8) for line in _body(n)}
+    pages = {}
+    for view in results:
+        if view.sentence in expected:
+            pages[view.sentence] = (view.page, view.section)
+    # Each page's first body line is glued to its banner and skipped; the rest keep their page
+    assert len(pages) >= 5 * 4
+    for sentence, (page, section) in pages.items():
+        assert page == expected[sentence]
+        assert section == ("Introduction" if page < 5 else "Methods")
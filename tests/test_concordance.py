@@ -0,0 +1,58 @@
+# tests/test_concordance.py
+import pytest
+
+from packages.concordance import ConcordanceIndex, locate_cue
+
+DOC = [
+    {"sentence": "We don't think this may hold.", "section": "Intro", "page": 3,
+     "markers": [{"stance_type": "hedging", "cue": "may", "start": 5, "end": 6}]},
+    {"sentence": "The results-based view clearly fails on p.5 data.", "section": "Results", "page": "7",
+     "markers": [{"stance_type": "boosting", "cue": "clearly", "start": 4, "end": 5}]},
+    {"sentence": "Results may be based on it.", "section": "Results", "page": None,
+     "markers": [{"stance_type": "hedging", "cue": "may", "start": 1, "end": 2}]},
+]
+
+@pytest.fixture
+def index(tmp_path):
+    idx = ConcordanceIndex(str(tmp_path / "conc.sqlite"), lemmatize=lambda cue: cue)
+    idx.add_document("thesis", DOC)
+    yield idx
+    idx.close()
+
+def _sentences(hits):
+    return [h["sentence"] for h in hits]
+
+@pytest.mark.parametrize("text, expected", [
+    ("don't", [DOC[0]["sentence"]]),
+    ("results-based", [DOC[1]["sentence"]]),
+    ("p.5", [DOC[1]["sentence"]]),
+    ("may be", [DOC[2]["sentence"]]),
+    ("be may", []),  # a phrase, not a bag of words
+])
+def test_text_is_a_phrase_query(index, text, expected):
+    assert _sentences(index.query(text=text)) == expected
+
+def test_raw_fts_syntax_and_errors(index):
+    assert len(index.query(text="results OR think", raw_fts=True)) == 3
+    if index.fts:
+        with pytest.raises(ValueError, match="Invalid text query"):
+            index.query(text="results-based", raw_fts=True)
+
+def test_filters_and_location(index):
+    hits = index.query(cue="MAY", section="Results")
+    assert [(h["page"], h["char_start"], h["char_end"]) for h in hits] == [(None, 8, 11)]
+    assert index.query(stance_type="boosting", page=7)[0]["cue"] == "clearly"
+
+def test_re_adding_a_document_replaces_it(index):
+    index.add_document("other", DOC[:1])
+    assert index.add_document("thesis", DOC[2:]) == 1
+    assert index.documents() == ["other", "thesis"]
+    assert _sentences(index.query(document="thesis")) == [DOC[2]["sentence"]]
+    assert _sentences(index.query(text="results-based")) == []  # old sentences left the FTS index too
+    assert len(index.query(text="don't")) == 1
+
+def test_locate_cue_prefers_the_token_position():
+    s = "It may rain, and it may not."
+    assert locate_cue(s, "may") == (3, 6)
+    assert locate_cue(s, "may", token_start=6) == (20, 23)
+    assert locate_cue(s, "might") == (None, None)
@@ -0,0 +1,21 @@
+# tests/test_corpus_pipeline.py
+from pathlib import Path
+
+import pytest
+
+from packages.corpus_pipeline import run_pipeline
+from packages.corpus_pipeline.pipeline import list_documents
+
+def test_list_documents(tmp_path):
+    for name in ("b.txt", "a.PDF", "notes.md"):
+        (tmp_path / name).write_text("x")
+    assert [Path(p).name for p in list_documents(tmp_path)] == ["a.PDF", "b.txt"]
+
+def test_duplicate_stems_fail_before_any_work(tmp_path):
+    src = tmp_path / "in"
+    src.mkdir()
+    (src / "thesis.pdf").write_bytes(b"%PDF")
+    (src / "thesis.txt").write_text("text")
+    with pytest.raises(ValueError, match="thesis.pdf/thesis.txt"):
+        run_pipeline(str(src), str(tmp_path / "out"), str(tmp_path / "cache"))
+    assert not (tmp_path / "out").exists() and not (tmp_path / "cache").exists()
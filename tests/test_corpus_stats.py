@@ -0,0 +1,35 @@
+# tests/test_corpus_stats.py
+import pytest
+
+from packages.corpus_stats import CorpusStats, UNKNOWN_PAGE, page_word_counts
+from packages.nltk_stance.attribution import PageIndex
+
+TEXT = ("preface\n--- Page 1 ---\nfront matter words\n--- Page 2 ---\nintro has four words\n"
+        "--- Page 3 ---\nmore intro\n--- Page 4 ---\nmethods text here\n")
+TOC = [("Introduction", 1, 2), ("Methods", 3, 4)]
+
+def _markers(*rows):
+    return [{"sentence": "s", "section": sec, "page": page,
+             "markers": [{"stance_type": t, "cue": "may", "start": 0, "end": 3}]} for sec, page, t in rows]
+
+def test_page_word_counts_by_section():
+    w = page_word_counts(TEXT, index=PageIndex(TEXT, TOC))
+    assert w.set_index(["section", "page"])["words"].to_dict() == {
+        ("", UNKNOWN_PAGE): 1, ("", 1): 3, ("Introduction", 2): 4, ("Introduction", 3): 2, ("Methods", 4): 3}
+
+def test_per_section_norms_use_section_word_counts():
+    stats = CorpusStats()
+    markers = _markers(("Introduction", 2, "hedging"), ("Introduction", 3, "hedging"), ("Methods", 4, "boosting"))
+    stats.add_document("doc", markers, TEXT, index=PageIndex(TEXT, TOC))
+    sec = stats.per_section().loc["doc"]
+    assert sec.loc["Introduction", "words"] == 6 and sec.loc["Methods", "words"] == 3
+    assert sec.loc["Introduction", "hedging_per_1k"] == pytest.approx(2 / 6 * 1000)
+    assert sec.loc["Methods", "boosting_per_1k"] == pytest.approx(1 / 3 * 1000)
+    assert stats.per_document().loc["doc", "words"] == 13
+
+def test_section_files_and_re_adding_a_document():
+    stats = CorpusStats()
+    stats.add_document("doc", _markers(("Methods", None, "hedging")), {"Methods": "one two three four"})
+    stats.add_document("doc", _markers(("Methods", None, "hedging")), {"Methods": "one two"})
+    sec = stats.per_section().loc["doc"]
+    assert sec.loc["Methods", "words"] == 2 and sec.loc["Methods", "hedging"] == 1
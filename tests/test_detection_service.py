@@ -0,0 +1,74 @@
+# tests/test_detection_service.py
+import http.client, json, os, socket, stat
+from threading import Thread
+
+import pytest
+
+from packages.detection_service import server as S
+
+@pytest.mark.parametrize("body, message", [
+    (b"not json", "Expecting value"),
+    (b"[1, 2]", "JSON object"),
+    (b"{}", "'text'"),
+    (b'{"text": 5}', "'text'"),
+    (b'{"text": "x", "section": 3}', "'section'"),
+    (b'{"text": "x", "page": "vii"}', "invalid literal"),
+    (b'{"text": "x", "toc": [["Intro", "one", 2]]}', "invalid literal"),
+    (b'{"text": "x", "strip_boilerplate": "yes"}', "'strip_boilerplate'"),
+])
+def test_parse_payload_rejects_malformed_bodies(body, message):
+    with pytest.raises((ValueError, TypeError), match=message):
+        S._parse_payload(body)
+
+def test_parse_payload_normalises():
+    p = S._parse_payload(b'{"text": "x", "page": "4", "toc": [["Intro", 1, 3]], "page_map": [[1, 3]]}')
+    assert (p["page"], p["toc"], p["page_map"], p["strip_boilerplate"]) == (4, [("Intro", 1, 3)], [(1, 3)], False)
+
+@pytest.fixture
+def http_service():
+    # Worker never started: requests stay queued, which is all the error paths need
+    service = S.DetectionService(max_queue=1, timeout=0.2)
+    server = S.make_server(service, "127.0.0.1:0")
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    def post(body):
+        conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+        conn.request("POST", "/detect", body=body, headers={"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        out = resp.status, dict(resp.getheaders()), json.loads(resp.read())
+        conn.close()
+        return out
+
+    yield service, post
+    server.shutdown()
+    server.server_close()
+
+def test_bad_requests_get_400(http_service):
+    service, post = http_service
+    status, _, body = post(b'{"text": 1}')
+    assert status == 400 and "'text'" in body["error"]
+    assert service.pending() == 0
+
+def test_full_queue_gets_503_and_timeout_504(http_service):
+    service, post = http_service
+    status, _, _ = post(b'{"text": "We may."}')
+    assert status == 504  # queued, never served
+    status, headers, body = post(b'{"text": "We may."}')
+    assert status == 503 and headers["Retry-After"] == "1" and "already queued" in body["error"]
+    assert service.counters() == {"requests": 0, "batches": 0, "rejected": 1, "timeouts": 1}
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="unix sockets only")
+def test_unix_server_replaces_stale_sockets_only(tmp_path):
+    path = str(tmp_path / "svc.sock")
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(path)
+    stale.close()
+    server = S.make_server(S.DetectionService(), f"unix:{path}")
+    assert stat.S_ISSOCK(os.lstat(path).st_mode)
+    server.server_close()
+
+    regular = tmp_path / "notes.txt"
+    regular.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        S.make_server(S.DetectionService(), f"unix:{regular}")
+    assert regular.read_text() == "keep me"
@@ -0,0 +1,54 @@
+# tests/test_evaluate.py
+import csv
+
+import pytest
+
+E = pytest.importorskip("packages.nltk_stance.evaluate")
+
+TEXT = "We may show that results are clear. It is clear that this matters. Our model might perhaps work."
+GOLD = [("We may show that results are clear.", "hedging", "may", 1, 2),
+        ("We may show that results are clear.", "boosting", "show", 2, 3),
+        ("Our model might perhaps work.", "hedging", "might", 2, 3)]
+
+@pytest.fixture
+def gold_csv(tmp_path):
+    path = tmp_path / "gold.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["sentence", "stance_type", "cue", "start", "end"])
+        writer.writerows(GOLD)
+    (tmp_path / "gold.txt").write_text(TEXT, encoding="utf-8")
+    return str(path)
+
+def _all(rows, mode):
+    return next(r for r in rows if r["mode"] == mode and r["stance_type"] == "all")
+
+def test_compact_agrees_with_reference(toy_detector, gold_csv):
+    rows, failures = E.evaluate([gold_csv], ["compact"])
+    assert failures == []
+    assert _all(rows, "reference")["recall"] == 1.0
+    assert _all(rows, "compact")["precision"] == _all(rows, "reference")["precision"]
+
+def test_regression_in_compact_fails(toy_detector, gold_csv, monkeypatch):
+    # The reference is the independent per-sentence loop, so breaking detect_compact() is caught
+    real = E.StanceDetector.detect_compact
+    monkeypatch.setattr(E.StanceDetector, "detect_compact",
+                        lambda self, *a, **k: real(self, *a, **k).filter(lambda v: "might" not in v["sentence"]))
+    rows, failures = E.evaluate([gold_csv], ["compact"])
+    assert len(failures) == 1 and failures[0].startswith("compact:")
+    assert _all(rows, "compact")["diff_vs_reference"] > 0
+
+def test_pool_modes_mark_peak_as_main_process_only(toy_detector, gold_csv, monkeypatch):
+    monkeypatch.setitem(E.MODES, "pooled", E.MODES["compact"])
+    monkeypatch.setattr(E, "POOL_MODES", {"pooled"})
+    rows, _ = E.evaluate([gold_csv], ["compact", "pooled"])
+    assert not _all(rows, "compact")["peak_main_only"] and _all(rows, "pooled")["peak_main_only"]
+    assert "main process only" in E.format_table(rows)
+
+def test_unknown_modes_are_rejected(gold_csv, monkeypatch, capsys):
+    with pytest.raises(ValueError, match="unknown mode"):
+        E.evaluate([gold_csv], ["compact", "fastest"])
+    monkeypatch.setattr("sys.argv", ["evaluate", gold_csv, "--modes", "fastest"])
+    with pytest.raises(SystemExit) as exc:
+        E.main()
+    assert exc.value.code == 2 and "unknown mode(s) fastest" in capsys.readouterr().err
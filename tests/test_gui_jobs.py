@@ -0,0 +1,53 @@
+# tests/test_gui_jobs.py
+import time
+from threading import Event
+
+import pytest
+
+main = pytest.importorskip("main")
+
+def _drain(manager, jobs, timeout=5):
+    deadline = time.monotonic() + timeout
+    while any(j.status in {"queued", "running"} for j in jobs):
+        assert time.monotonic() < deadline, "jobs did not finish"
+        time.sleep(0.01)
+    manager.poll()
+
+def test_results_and_errors_reach_callbacks_on_poll():
+    manager = main.JobManager(workers=2)
+    seen = []
+
+    def work(job):
+        for i in range(3):
+            job.report(i + 1, 3, "step")
+        return "result"
+
+    def boom(job):
+        raise RuntimeError("broken")
+
+    ok = manager.submit("ok", work, on_done=seen.append)
+    bad = manager.submit("bad", boom, on_done=seen.append, on_error=lambda e: seen.append(str(e)))
+    assert seen == []  # callbacks only run from poll(), i.e. on the Tk thread
+    _drain(manager, [ok, bad])
+    assert sorted(seen) == ["broken", "result"]
+    assert (ok.status, ok.fraction, ok.message) == ("done", 1.0, "step")
+    assert (bad.status, bad.message) == ("failed", "broken")
+    assert manager.active() == []
+
+def test_cancel_reaches_the_worker_through_report():
+    manager = main.JobManager(workers=1)
+    started, seen = Event(), []
+
+    def long_job(job):
+        started.set()
+        while True:
+            job.report(0, 10)
+            time.sleep(0.005)
+
+    running = manager.submit("long", long_job, on_done=seen.append)
+    queued = manager.submit("queued", lambda job: "never", on_done=seen.append)
+    assert started.wait(5)
+    manager.cancel_all()
+    _drain(manager, [running, queued])
+    assert running.status == queued.status == "cancelled"
+    assert seen == []
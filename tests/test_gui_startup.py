@@ -0,0 +1,15 @@
+# tests/test_gui_startup.py
+import subprocess, sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+HEAVY = ("nltk", "fitz", "pandas", "numpy", "google.generativeai", "tenacity")
+
+def test_importing_the_gui_leaves_heavy_packages_unloaded():
+    code = f"import sys, main; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).resolve().parents[1],
+                         capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
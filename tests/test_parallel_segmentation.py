@@ -0,0 +1,96 @@
+# tests/test_parallel_segmentation.py
+import random, re
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+P = pytest.importorskip("packages.nltk_stance.preprocessor")
+
+def _toy_split(text):
+    # Local decisions only, like Punkt: break after . ! ? when an upper-case word follows
+    return [s for s in re.split(r"(?<=[.!?])\s+(?=[A-Z])", text) if s] if text else []
+
+class _ToyTagger:
+    def tag_sents(self, sentences):
+        return [[(w, "NN") for w in s] for s in sentences]
+
+def _document(seed=1, words=4000):
+    rng = random.Random(seed)
+    vocab = "we may show results clearly that. Data suggest it. the heading Intro text here. e.g. this".split()
+    parts = []
+    for i in range(words):
+        parts.append(rng.choice(vocab))
+        if rng.random() < 0.05:
+            parts.append("\n\n")
+        if rng.random() < 0.01:
+            parts.append(f"\n--- Page {i} ---\n")
+    return " ".join(parts)
+
+@pytest.fixture
+def toy_nltk(monkeypatch):
+    monkeypatch.setattr(P, "sent_tokenize", _toy_split)
+    monkeypatch.setattr(P, "word_tokenize", str.split)
+    monkeypatch.setattr(P, "get_tagger", lambda: _ToyTagger())
+    monkeypatch.setattr(P, "lemmatize", lambda w, t: w.lower())
+    monkeypatch.setattr(P, "_pool", lambda workers: ThreadPoolExecutor(workers))
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_chunked_split_matches_sequential(toy_nltk, seed):
+    pre = P.TextPreprocessor(_document(seed))
+    assert len(pre.chunks(500)) > 10
+    sentences, analyses = pre.analyze_parallel(workers=4, chunk_chars=500)
+    assert sentences == pre.tokenize_sentences()
+    # Sentences stay in order as slices of the joined clean text
+    clean, cursor = pre.clean_text(), 0
+    for sent in sentences:
+        cursor = clean.index(sent, cursor) + len(sent)
+    for sent, (tokens, tags, lemmas) in analyses.items():
+        assert tokens == sent.split() and len(tags) == len(lemmas) == len(tokens)
+
+def test_seam_without_sentence_end_is_merged(toy_nltk):
+    pre = P.TextPreprocessor("First part ends. A heading\n\nwithout a full stop. Then more.")
+    sentences, _ = pre.analyze_parallel(workers=2, chunk_chars=1)
+    assert len(pre.chunks(1)) == 2
+    assert sentences == ["First part ends.", "A heading without a full stop.", "Then more."]
+
+def test_punkt_chunked_split_matches_sequential():
+    nltk = pytest.importorskip("nltk")
+    try:
+        nltk.data.find("tokenizers/punkt_tab")
+        nltk.data.find("taggers/averaged_perceptron_tagger_eng")
+        nltk.data.find("corpora/wordnet")
+    except LookupError:
+        pytest.skip("NLTK data not installed")
+    paragraphs = [
+        "Results were reported by Smith et al.",
+        "in earlier work, e.g.",
+        "the 2019 survey. We may suggest that the effect is large.",
+        "CHAPTER 2",
+        "Methods. Data were collected (see Fig. 3). It is clear that this matters!",
+        "--- Page 7 ---",
+        "approx. 40 participants took part. Our findings indicate otherwise?",
+    ] * 20
+    pre = P.TextPreprocessor("\n\n".join(paragraphs))
+    sentences, _ = pre.analyze_parallel(workers=2, chunk_chars=200)
+    assert sentences == pre.tokenize_sentences()
+
+def test_split_only_skips_tagging(toy_nltk, monkeypatch):
+    monkeypatch.setattr(P, "get_tagger", lambda: pytest.fail("split-only path must not tag"))
+    pre = P.TextPreprocessor(_document(4))
+    sentences, analyses = pre.analyze_parallel(workers=4, chunk_chars=500, tag=False)
+    assert sentences == pre.tokenize_sentences()
+    assert analyses == {}
+
+def test_one_pool_is_kept_and_replaced_on_resize():
+    P.shutdown_pool()
+    first = P._pool(2)
+    assert P._pool(2) is first
+    second = P._pool(3)
+    assert second is not first
+    with pytest.raises(RuntimeError):
+        first.submit(int)  # the old pool was shut down
+    P.shutdown_pool()
+    with pytest.raises(RuntimeError):
+        second.submit(int)
+    assert P._pool(2) is not first
+    P.shutdown_pool()
@@ -0,0 +1,41 @@
+# tests/test_results_model.py
+import csv
+
+import pytest
+
+main = pytest.importorskip("main")
+
+ROWS = [
+    ("We may see.", "hedging", "may", 1, 2, "Intro", 3),
+    ("Data show it.", "boosting", "show", 1, 2, "Results", 10),
+    ("It might work.", "hedging", "might", 1, 2, None, None),
+    ("Results may vary.", "hedging", "may", 1, 2, "Results", 2),
+]
+
+def test_filters_and_sorting():
+    model = main.ResultsModel(list(ROWS))
+    assert model.select(stance_type="hedging") == [0, 2, 3]
+    assert model.select(cue=" MAY ") == [0, 3]
+    assert model.select(section="Results", sort_column="page") == [3, 1]
+    # Numbers before blanks; descending reverses the whole order
+    assert model.select(sort_column="page") == [3, 0, 1, 2]
+    assert model.select(sort_column="page", descending=True) == [2, 1, 0, 3]
+    assert model.view == [0, 1, 2, 3]  # select() leaves the shown view alone
+    assert model.apply(stance_type="boosting") == 1 and model.view == [1]
+
+def test_paging_and_distinct_values():
+    model = main.ResultsModel(list(ROWS) * 5)
+    assert len(model.page(0, 8)) == 8 and len(model.page(2, 8)) == 4 and model.page(3, 8) == []
+    assert model.distinct("section") == ["Intro", "Results"]
+
+def test_from_markers_and_csv(tmp_path):
+    markers = [{"sentence": "We may see.", "section": "Intro", "page": 3,
+                "markers": [{"stance_type": "hedging", "cue": "may", "start": 1, "end": 2}]}]
+    assert main.ResultsModel.from_markers(markers).rows == [ROWS[0]]
+    path = tmp_path / "stance.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(main.RESULT_COLUMNS)
+        writer.writerows(ROWS)
+    rows = main.ResultsModel.from_csv(str(path)).rows
+    assert rows[0] == ROWS[0] and rows[2][5:] == ("", "")
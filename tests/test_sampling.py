@@ -0,0 +1,46 @@
+# tests/test_sampling.py
+import pandas as pd
+import pytest
+
+# The package __init__ imports the validator and its dependencies
+S = pytest.importorskip("packages.gemini_validator.sampling")
+estimate_precision, sample_size, stratified_sample = S.estimate_precision, S.sample_size, S.stratified_sample
+
+def _frame(counts):
+    """counts: {(stance_type, cue, section): rows}"""
+    rows = [{"stance_type": t, "cue": c, "section": s, "sentence": f"{c} {i}"}
+            for (t, c, s), n in counts.items() for i in range(n)]
+    return pd.DataFrame(rows)
+
+def test_sample_size():
+    assert sample_size(0, 0.05) == 0
+    assert sample_size(10, 0.05) == 10
+    assert sample_size(100_000, 0.05) == 383  # Cochran: 384.1 with FPC
+    assert sample_size(1000, 0.05) == 278
+    assert sample_size(1000, 0.10) < sample_size(1000, 0.05)
+
+def test_allocation_is_proportional_with_one_per_stratum():
+    df = _frame({("hedging", "may", "Intro"): 600, ("hedging", "might", "Intro"): 300,
+                 ("hedging", "perhaps", "Results"): 3, ("boosting", "show", "Intro"): 40})
+    s = stratified_sample(df, margin=0.1)
+    per = s.groupby("stratum").size()
+    assert len(s[s.stance_type == "hedging"]) == sample_size(903, 0.1)
+    assert len(s[s.stance_type == "boosting"]) == sample_size(40, 0.1)
+    assert per["hedging|perhaps|Results"] >= 1
+    assert abs(per["hedging|may|Intro"] / per["hedging|might|Intro"] - 2) < 0.1
+    assert s.index.is_unique
+
+def test_many_singleton_strata_stay_within_sample_size():
+    df = _frame({("hedging", f"cue{i}", "Intro"): 1 for i in range(500)} | {("hedging", "may", "Intro"): 500})
+    n = sample_size(len(df), 0.1)
+    s = stratified_sample(df, margin=0.1)
+    assert len(s) == n
+    assert s.stratum.nunique() == n
+    assert "hedging|*" in set(s.stratum) and "hedging|may|Intro" in set(s.stratum)
+
+def test_precision_with_pooled_stratum():
+    df = _frame({("hedging", f"cue{i}", "Intro"): 1 for i in range(300)} | {("hedging", "may", "Intro"): 300})
+    s = stratified_sample(df, margin=0.1)
+    report = estimate_precision(df, s.assign(correct=True)).iloc[0]
+    assert report.population == 600 and report.sampled == len(s)
+    assert report.precision == 1.0 and 0 < report.ci_low < 1.0
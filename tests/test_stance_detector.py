@@ -0,0 +1,43 @@
+# tests/test_stance_detector.py
+import pytest
+
+SD = pytest.importorskip("packages.nltk_stance.stance_detector")
+from packages.nltk_stance.results import DetectionResults
+
+TEXT = ("We may show that results are clear. It is clear that this matters. The data do not show it. "
+        "Figure 3 shows data. Our model might perhaps work.")
+
+GOLDEN = [
+    {"sentence": "We may show that results are clear.", "section": "Results", "page": 4, "markers": [
+        {"stance_type": "self_mention", "cue": "we", "start": 0, "end": 1},
+        {"stance_type": "hedging", "cue": "may", "start": 1, "end": 2},
+        {"stance_type": "boosting", "cue": "show", "start": 2, "end": 3}]},
+    {"sentence": "It is clear that this matters.", "section": "Results", "page": 4, "markers": [
+        {"stance_type": "boosting", "cue": "it is clear that", "start": 0, "end": 4}]},
+    {"sentence": "Our model might perhaps work.", "section": "Results", "page": 4, "markers": [
+        {"stance_type": "self_mention", "cue": "our", "start": 0, "end": 1},
+        {"stance_type": "hedging", "cue": "might", "start": 2, "end": 3},
+        {"stance_type": "hedging", "cue": "perhaps", "start": 3, "end": 4}]},
+]
+
+def test_golden_output(toy_detector):
+    det = SD.StanceDetector(TEXT, section_name="Results", page=4)
+    assert det.detect_stance_markers_reference() == GOLDEN
+    assert det.detect_stance_markers() == GOLDEN
+    assert det.detect_compact().to_dicts() == GOLDEN
+
+def test_compact_matches_reference_with_precomputed_analyses(toy_detector):
+    det = SD.StanceDetector(TEXT * 3)
+    analyses = det.analyze_many(det.sentences)
+    assert det.detect_compact(analyses=analyses).to_dicts() == det.detect_stance_markers_reference()
+
+@pytest.mark.parametrize("page, stored", [(None, None), ("", None), (7, 7), ("7", 7), (7.0, 7)])
+def test_append_accepts_page_numbers(page, stored):
+    results = DetectionResults("s")
+    results.append("s", [("hedging", "may", 0, 1)], page=page)
+    assert results[0]["page"] == stored
+
+@pytest.mark.parametrize("page", ["vii", 7.5, -2, object()])
+def test_append_rejects_other_pages(page):
+    with pytest.raises(ValueError, match="PDF page number"):
+        DetectionResults("s").append("s", [], page=page)